@@ -2,9 +2,13 @@
 #define THYME_ENVIRONMENTS_ROVERS_PACK
 
 #include <functional>
+#include <memory>
 #include <rovers/core/detail/agent_types.hpp>
 #include <rovers/core/detail/entity_types.hpp>
+#include <rovers/core/detail/world.hpp>
 #include <rovers/utilities/ranges.hpp>
+#include <utility>
+#include <vector>
 
 /*
  *
@@ -13,13 +17,45 @@
  */
 namespace rovers {
 
+/*
+ * Packs either own copies of their agents/entities (the public constructors, safe to build from
+ * temporaries in the bindings) or are views of containers that outlive them (view(), used on the
+ * c++ hot path: no copies, no reference count traffic).
+ */
 struct AgentPack {
     AgentPack(const Agent& agent, const std::vector<Agent>& agents,
               const std::vector<Entity>& entities)
-        : agent(agent), agents(agents), entities(entities) {}
-    Agent agent;
-    std::vector<Agent> agents;
-    std::vector<Entity> entities;
+        : AgentPack(std::make_shared<const Storage>(Storage{agent, agents, entities})) {}
+
+    // world: set by the environment when agents/entities are all of its rovers/pois
+    static AgentPack view(const Agent& agent, const std::vector<Agent>& agents,
+                          const std::vector<Entity>& entities, const World* world = nullptr) {
+        return {agent, agents, entities, world};
+    }
+
+   private:
+    struct Storage {
+        Agent agent;
+        std::vector<Agent> agents;
+        std::vector<Entity> entities;
+    };
+    explicit AgentPack(std::shared_ptr<const Storage> storage)
+        : m_storage(std::move(storage)),
+          agent(m_storage->agent),
+          agents(m_storage->agents),
+          entities(m_storage->entities),
+          world(nullptr) {}
+    AgentPack(const Agent& agent, const std::vector<Agent>& agents,
+              const std::vector<Entity>& entities, const World* world)
+        : agent(agent), agents(agents), entities(entities), world(world) {}
+
+    std::shared_ptr<const Storage> m_storage;
+
+   public:
+    const Agent& agent;
+    const std::vector<Agent>& agents;
+    const std::vector<Entity>& entities;
+    const World* world;
 };
 
 AgentPack from_filter(const AgentPack& pack, std::function<bool(const Agent&)> predicate) {
@@ -29,10 +65,37 @@ AgentPack from_filter(const AgentPack& pack, std::function<bool(const Agent&)> p
 struct EntityPack {
     EntityPack(const Entity& entity, const std::vector<Agent>& agents,
                const std::vector<Entity>& entities)
-        : entity(entity), agents(agents), entities(entities) {}
-    Entity entity;
-    std::vector<Agent> agents;
-    std::vector<Entity> entities;
+        : EntityPack(std::make_shared<const Storage>(Storage{entity, agents, entities})) {}
+
+    // world: set by the environment when agents/entities are all of its rovers/pois
+    static EntityPack view(const Entity& entity, const std::vector<Agent>& agents,
+                           const std::vector<Entity>& entities, const World* world = nullptr) {
+        return {entity, agents, entities, world};
+    }
+
+   private:
+    struct Storage {
+        Entity entity;
+        std::vector<Agent> agents;
+        std::vector<Entity> entities;
+    };
+    explicit EntityPack(std::shared_ptr<const Storage> storage)
+        : m_storage(std::move(storage)),
+          entity(m_storage->entity),
+          agents(m_storage->agents),
+          entities(m_storage->entities),
+          world(nullptr) {}
+    EntityPack(const Entity& entity, const std::vector<Agent>& agents,
+               const std::vector<Entity>& entities, const World* world)
+        : entity(entity), agents(agents), entities(entities), world(world) {}
+
+    std::shared_ptr<const Storage> m_storage;
+
+   public:
+    const Entity& entity;
+    const std::vector<Agent>& agents;
+    const std::vector<Entity>& entities;
+    const World* world;
 };
 
 EntityPack from_filter(const EntityPack& pack, std::function<bool(const Entity&)> predicate) {
@@ -0,0 +1,129 @@
+#ifndef THYME_ENVIRONMENTS_ROVERS_PROFILER
+#define THYME_ENVIRONMENTS_ROVERS_PROFILER
+
+#include <algorithm>
+#include <array>
+#include <chrono>
+#include <vector>
+
+namespace rovers {
+
+/*
+ *
+ * Cumulative time and call counts of the phases of Environment::step/reset, in total and per
+ * rover/poi. Only records when built with -DROVERS_PROFILE; otherwise scopes are empty and
+ * every reading stays zero.
+ *
+ */
+class Profiler {
+    using Clock = std::chrono::steady_clock;
+
+   public:
+    enum Phase : std::size_t {
+        RoverUpdate,  // rover->update()
+        Act,          // rover->act()
+        Clamp,        // clamp_bounds()
+        PoiUpdate,    // poi->update()
+        World,        // spatial index and neighbour cache
+        Constraints,  // poi constraints and counterfactuals
+        Batches,      // scan_batch/compute_batch
+        Scan,         // rover->scan()/scan_into()
+        Reward,       // rover->reward()
+        Reset,        // initialization policy
+    };
+    static constexpr std::size_t num_phases = Reset + 1;
+#ifdef ROVERS_PROFILE
+    static constexpr bool enabled = true;
+#else
+    static constexpr bool enabled = false;
+#endif
+
+    static const char* name(std::size_t phase) {
+        static constexpr std::array<const char*, num_phases> names = {
+            "rover_update", "act", "clamp", "poi_update", "world",
+            "constraints", "batches", "scan", "reward", "reset"};
+        return names[phase];
+    }
+
+    // times a phase until it goes out of scope, for one rover/poi if given a slot
+    class Scope {
+       public:
+        Scope(const Scope&) = delete;
+        Scope& operator=(const Scope&) = delete;
+#ifdef ROVERS_PROFILE
+        Scope(double& seconds, std::size_t& calls, double* item_seconds, std::size_t* item_calls)
+            : m_seconds(seconds),
+              m_calls(calls),
+              m_item_seconds(item_seconds),
+              m_item_calls(item_calls),
+              m_start(Clock::now()) {}
+        ~Scope() {
+            const double elapsed = std::chrono::duration<double>(Clock::now() - m_start).count();
+            m_seconds += elapsed;
+            ++m_calls;
+            if (m_item_seconds) {
+                *m_item_seconds += elapsed;
+                ++*m_item_calls;
+            }
+        }
+
+       private:
+        double& m_seconds;
+        std::size_t& m_calls;
+        double* m_item_seconds;
+        std::size_t* m_item_calls;
+        Clock::time_point m_start;
+#else
+        // user-provided destructor: no unused variable warnings at the call sites
+        Scope(double&, std::size_t&, double*, std::size_t*) {}
+        ~Scope() {}
+#endif
+    };
+
+    Scope time(Phase phase) { return {m_seconds[phase], m_calls[phase], nullptr, nullptr}; }
+    Scope time_rover(Phase phase, std::size_t rover) {
+        const std::size_t i = rover * num_phases + phase;
+        return {m_seconds[phase], m_calls[phase], &m_rover_seconds[i], &m_rover_calls[i]};
+    }
+    Scope time_poi(Phase phase, std::size_t poi) {
+        const std::size_t i = poi * num_phases + phase;
+        return {m_seconds[phase], m_calls[phase], &m_poi_seconds[i], &m_poi_calls[i]};
+    }
+
+    void resize(std::size_t num_rovers, std::size_t num_pois) {
+        m_rover_seconds.resize(num_rovers * num_phases);
+        m_rover_calls.resize(num_rovers * num_phases);
+        m_poi_seconds.resize(num_pois * num_phases);
+        m_poi_calls.resize(num_pois * num_phases);
+    }
+    // zeroes all readings, e.g. between episodes
+    void reset() {
+        m_seconds.fill(0.0);
+        m_calls.fill(0);
+        std::fill(m_rover_seconds.begin(), m_rover_seconds.end(), 0.0);
+        std::fill(m_rover_calls.begin(), m_rover_calls.end(), 0);
+        std::fill(m_poi_seconds.begin(), m_poi_seconds.end(), 0.0);
+        std::fill(m_poi_calls.begin(), m_poi_calls.end(), 0);
+    }
+
+    // totals by phase
+    const std::array<double, num_phases>& seconds() const { return m_seconds; }
+    const std::array<std::size_t, num_phases>& calls() const { return m_calls; }
+    // (num_rovers x num_phases) and (num_pois x num_phases), row-major
+    const std::vector<double>& rover_seconds() const { return m_rover_seconds; }
+    const std::vector<std::size_t>& rover_calls() const { return m_rover_calls; }
+    const std::vector<double>& poi_seconds() const { return m_poi_seconds; }
+    const std::vector<std::size_t>& poi_calls() const { return m_poi_calls; }
+
+   private:
+    std::array<double, num_phases> m_seconds{};
+    std::array<std::size_t, num_phases> m_calls{};
+    std::vector<double> m_rover_seconds;
+    std::vector<std::size_t> m_rover_calls;
+    std::vector<double> m_poi_seconds;
+    std::vector<std::size_t> m_poi_calls;
+};
+
+}  // namespace rovers
+
+#endif
@@ -0,0 +1,155 @@
+#ifndef THYME_ENVIRONMENTS_ROVERS_RECORDER
+#define THYME_ENVIRONMENTS_ROVERS_RECORDER
+
+#include <Eigen/Dense>
+#include <algorithm>
+#include <cstdint>
+#include <cstdio>
+#include <iterator>
+#include <rovers/core/detail/world.hpp>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace rovers {
+
+/*
+ *
+ * Append-only episode log with one fixed-size record per reset/step, buffered in large chunks.
+ * Read back with python/recording.py (memory mapped, no copies).
+ *
+ * Layout (little-endian on every host):
+ *   header, 64 bytes:   char magic[8] = "ROVREC01", then uint64 header_size, num_rovers,
+ *                       num_pois, state_dim, action_dim, record_size, 0
+ *   record, packed:     uint32 episode, uint32 step, float32 position[num_rovers][2],
+ *                       float32 state[num_rovers][state_dim], float32 action[num_rovers][action_dim],
+ *                       float32 reward[num_rovers], uint8 observed[num_pois]
+ * The state size is fixed by the first record: longer states are cut, shorter ones zero padded.
+ * Without rovers it is 0.
+ * Actions are zero for the record written by a reset.
+ *
+ */
+class Recorder {
+   public:
+    static constexpr char magic[8] = {'R', 'O', 'V', 'R', 'E', 'C', '0', '1'};
+    static constexpr std::uint64_t header_size = 64;
+
+    Recorder(const std::string& path, std::size_t action_dim = 2,
+             std::size_t chunk_size = std::size_t(1) << 20)
+        : m_file(std::fopen(path.c_str(), "wb")), m_action_dim(action_dim), m_chunk_size(chunk_size) {
+        if (!m_file) throw std::runtime_error("Recorder: cannot open " + path);
+        m_chunk.reserve(m_chunk_size);
+    }
+    Recorder(const Recorder&) = delete;
+    Recorder& operator=(const Recorder&) = delete;
+    ~Recorder() { close(); }
+
+    // the next record starts a new episode at step 0, with zero actions
+    void begin_episode() {
+        if (m_written || m_step > 0) ++m_episode;
+        m_step = 0;
+        std::fill(m_actions.begin(), m_actions.end(), 0.0f);
+    }
+    void set_action(std::size_t rover, const Eigen::MatrixXd& action) {
+        if (m_actions.size() < (rover + 1) * m_action_dim)
+            m_actions.resize((rover + 1) * m_action_dim, 0.0f);
+        const std::size_t size = std::min<std::size_t>(action.size(), m_action_dim);
+        float* row = m_actions.data() + rover * m_action_dim;
+        std::fill(row, row + m_action_dim, 0.0f);
+        for (std::size_t k = 0; k < size; ++k) row[k] = action(k);
+    }
+
+    // state(i) and reward(i): rover i's state column and reward this step
+    template <typename StateAt, typename RewardAt>
+    void write(const World& world, StateAt&& state, RewardAt&& reward) {
+        const std::size_t num_rovers = world.agents.size(), num_pois = world.entities.size();
+        if (!m_written) write_header(num_rovers, num_pois, num_rovers > 0 ? state(0).size() : 0);
+        if (num_rovers != m_num_rovers || num_pois != m_num_pois)
+            throw std::runtime_error("Recorder: number of rovers or pois changed");
+
+        // floats are staged in one array, then the whole record is copied to the chunk
+        m_values.resize(num_rovers * (2 + m_state_dim + m_action_dim + 1));
+        float* values = m_values.data();
+        for (const auto& position : world.agents.position) {
+            *values++ = position.x;
+            *values++ = position.y;
+        }
+        for (std::size_t i = 0; i < num_rovers; ++i) {
+            const auto& column = state(i);
+            const std::size_t size = std::min<std::size_t>(column.size(), m_state_dim);
+            for (std::size_t k = 0; k < size; ++k) values[k] = column(k);
+            std::fill(values + size, values + m_state_dim, 0.0f);
+            values += m_state_dim;
+        }
+        values = std::copy(m_actions.begin(), m_actions.end(), values);
+        for (std::size_t i = 0; i < num_rovers; ++i) *values++ = reward(i);
+
+        const std::uint32_t ids[2] = {std::uint32_t(m_episode), std::uint32_t(m_step++)};
+        append(ids, 2);
+        append(m_values.data(), m_values.size());
+        append(world.entities.observed.data(), num_pois);
+        ++m_records;
+        if (m_chunk.size() >= m_chunk_size) flush();
+    }
+
+    void flush() {
+        if (!m_file) return;
+        if (!m_chunk.empty()) std::fwrite(m_chunk.data(), 1, m_chunk.size(), m_file);
+        m_chunk.clear();
+        std::fflush(m_file);
+    }
+    void close() {
+        if (!m_file) return;
+        flush();
+        std::fclose(m_file);
+        m_file = nullptr;
+    }
+
+    std::size_t records() const { return m_records; }
+    std::size_t record_size() const { return m_record_size; }
+
+   private:
+    void write_header(std::size_t num_rovers, std::size_t num_pois, std::size_t state_dim) {
+        m_num_rovers = num_rovers, m_num_pois = num_pois, m_state_dim = state_dim;
+        m_record_size = 2 * sizeof(std::uint32_t) +
+                        sizeof(float) * num_rovers * (2 + state_dim + m_action_dim + 1) + num_pois;
+        const std::uint64_t fields[7] = {header_size, num_rovers,    num_pois, state_dim,
+                                         m_action_dim, m_record_size, 0};
+        append(magic, sizeof(magic));
+        append(fields, 7);
+        m_actions.resize(num_rovers * m_action_dim, 0.0f);
+        m_written = true;
+    }
+    // count values of T, byte swapped on big-endian hosts
+    template <typename T>
+    void append(const T* data, std::size_t count) {
+        const char* bytes = reinterpret_cast<const char*>(data);
+        if (sizeof(T) == 1 || little_endian()) {
+            m_chunk.insert(m_chunk.end(), bytes, bytes + count * sizeof(T));
+            return;
+        }
+        for (std::size_t k = 0; k < count; ++k, bytes += sizeof(T))
+            m_chunk.insert(m_chunk.end(), std::make_reverse_iterator(bytes + sizeof(T)),
+                           std::make_reverse_iterator(bytes));
+    }
+    static bool little_endian() {
+        const std::uint16_t probe = 1;
+        return *reinterpret_cast<const unsigned char*>(&probe) == 1;
+    }
+
+   private:
+    std::FILE* m_file;
+    std::size_t m_action_dim;
+    std::size_t m_chunk_size;
+    std::vector<char> m_chunk;
+
+    bool m_written{false};
+    std::size_t m_num_rovers{0}, m_num_pois{0}, m_state_dim{0}, m_record_size{0};
+    std::size_t m_episode{0}, m_step{0}, m_records{0};
+    std::vector<float> m_actions;
+    std::vector<float> m_values;
+};
+
+}  // namespace rovers
+
+#endif
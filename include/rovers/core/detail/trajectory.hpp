@@ -0,0 +1,177 @@
+#ifndef THYME_ENVIRONMENTS_ROVERS_TRAJECTORY
+#define THYME_ENVIRONMENTS_ROVERS_TRAJECTORY
+
+#include <algorithm>
+#include <memory>
+#include <rovers/utilities/math/cartesian.hpp>
+#include <vector>
+
+namespace rovers {
+
+// how much of the agents' paths to keep
+enum class PathHistory { Off, Recent, Full };
+
+/*
+ *
+ * Position history of all agents, packed as float32 frames of (num_agents x 2), one per step.
+ * Recent keeps the last `length` frames in a ring buffer. Full keeps every frame in chunks of
+ * chunk_frames frames that marks share: a chunk is copied before it is written to while a mark
+ * still holds it.
+ *
+ */
+class Trajectory {
+    using Point = thyme::math::Point;
+    using Chunk = std::vector<float>;
+
+   public:
+    static constexpr std::size_t chunk_frames = 64;
+
+    explicit Trajectory(PathHistory history = PathHistory::Full, std::size_t length = 0)
+        : m_history(history), m_length(length) {}
+
+    void configure(PathHistory history, std::size_t length = 0) {
+        m_history = history;
+        m_length = length;
+        clear();
+        m_frames.shrink_to_fit();
+        m_chunks.shrink_to_fit();
+    }
+    void clear() {
+        m_frames.clear();
+        m_chunks.clear();
+        m_start = m_size = 0;
+    }
+
+    void record(const std::vector<Point>& positions) {
+        if (m_history == PathHistory::Off) return;
+        if (m_history == PathHistory::Recent && m_length == 0) return;
+        if (positions.size() != m_agents) {
+            clear();
+            m_agents = positions.size();
+        }
+
+        const std::size_t frame_size = 2 * m_agents;
+        float* frame;
+        if (m_history == PathHistory::Full) {
+            const std::size_t offset = (m_size % chunk_frames) * frame_size;
+            if (offset == 0) {
+                m_chunks.push_back(std::make_shared<Chunk>());
+                m_chunks.back()->reserve(chunk_frames * frame_size);
+            } else if (m_chunks.back().use_count() > 1) {
+                // shared with a mark: write to a copy
+                auto copy = std::make_shared<Chunk>();
+                copy->reserve(chunk_frames * frame_size);
+                copy->assign(m_chunks.back()->begin(), m_chunks.back()->begin() + offset);
+                m_chunks.back() = std::move(copy);
+            }
+            Chunk& chunk = *m_chunks.back();
+            chunk.resize(offset + frame_size);
+            frame = chunk.data() + offset;
+            ++m_size;
+        } else if (m_size == m_length) {
+            // overwrite the oldest frame
+            frame = m_frames.data() + m_start * frame_size;
+            m_start = (m_start + 1) % m_length;
+        } else {
+            m_frames.reserve(m_length * frame_size);
+            m_frames.resize(m_frames.size() + frame_size);
+            frame = m_frames.data() + m_size * frame_size;
+            ++m_size;
+        }
+        for (std::size_t i = 0; i < m_agents; ++i) {
+            frame[2 * i] = positions[i].x;
+            frame[2 * i + 1] = positions[i].y;
+        }
+    }
+
+    // point in the history to come back to, see World::snapshot. A Full mark shares the chunks
+    // recorded so far, so marking costs one pointer per chunk_frames frames; the bounded ring of
+    // Recent is copied.
+    struct Mark {
+        PathHistory history{PathHistory::Off};
+        std::size_t length{0};
+        std::size_t agents{0};
+        std::size_t size{0};
+        std::size_t start{0};
+        std::vector<float> frames;
+        std::vector<std::shared_ptr<const Chunk>> chunks;
+    };
+    void mark(Mark& into) const {
+        into.history = m_history;
+        into.length = m_length;
+        into.agents = m_agents;
+        into.size = m_size;
+        into.start = m_start;
+        if (m_history == PathHistory::Recent)
+            into.frames = m_frames;
+        else
+            into.frames.clear();
+        into.chunks.assign(m_chunks.begin(), m_chunks.end());
+    }
+    // brings back the frames of the mark, whatever was recorded since: later steps, another
+    // branch or a reset. A mark taken with another history setting (see configure) clears it.
+    void rewind(const Mark& to) {
+        if (to.history != m_history || to.length != m_length) {
+            clear();
+            return;
+        }
+        m_agents = to.agents;
+        m_size = to.size;
+        m_start = to.start;
+        if (m_history == PathHistory::Recent) m_frames = to.frames;
+        m_chunks.clear();
+        for (const auto& chunk : to.chunks) m_chunks.push_back(std::const_pointer_cast<Chunk>(chunk));
+    }
+
+    const PathHistory& history() const { return m_history; }
+    // number of recorded frames and agents per frame
+    std::size_t size() const { return m_size; }
+    std::size_t agents() const { return m_agents; }
+
+    // position of an agent in a frame, oldest frame first
+    Point at(std::size_t frame, std::size_t agent) const {
+        const float* f = data(frame);
+        return {f[2 * agent], f[2 * agent + 1]};
+    }
+    std::vector<Point> path(std::size_t agent) const {
+        std::vector<Point> path;
+        if (agent >= m_agents) return path;
+        path.reserve(m_size);
+        for (std::size_t k = 0; k < m_size; ++k) path.push_back(at(k, agent));
+        return path;
+    }
+    // all frames, oldest first, as one (frames x agents x 2) array
+    std::vector<float> packed() const {
+        const std::size_t frame_size = 2 * m_agents;
+        std::vector<float> packed(m_size * frame_size);
+        for (std::size_t k = 0; k < m_size; ++k) {
+            const float* f = data(k);
+            std::copy(f, f + frame_size, packed.begin() + k * frame_size);
+        }
+        return packed;
+    }
+
+   private:
+    // first float of a frame, oldest frame first
+    const float* data(std::size_t frame) const {
+        const std::size_t frame_size = 2 * m_agents;
+        if (m_history == PathHistory::Full)
+            return m_chunks[frame / chunk_frames]->data() + (frame % chunk_frames) * frame_size;
+        return m_frames.data() + ((m_start + frame) % m_size) * frame_size;
+    }
+
+    PathHistory m_history;
+    std::size_t m_length;
+
+    // Recent: ring of frames
+    std::vector<float> m_frames;
+    // Full: chunks of chunk_frames frames, shared with marks
+    std::vector<std::shared_ptr<Chunk>> m_chunks;
+    std::size_t m_agents{0};
+    std::size_t m_start{0};
+    std::size_t m_size{0};
+};
+
+}  // namespace rovers
+
+#endif
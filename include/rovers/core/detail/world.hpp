@@ -0,0 +1,306 @@
+#ifndef THYME_ENVIRONMENTS_ROVERS_WORLD
+#define THYME_ENVIRONMENTS_ROVERS_WORLD
+
+#include <algorithm>
+#include <cassert>
+#include <cstdint>
+#include <rovers/core/detail/trajectory.hpp>
+#include <rovers/utilities/math/cartesian.hpp>
+#include <rovers/utilities/math/norms.hpp>
+#include <rovers/utilities/math/random.hpp>
+#include <rovers/utilities/spatial/grid.hpp>
+#include <rovers/utilities/span.hpp>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+/*
+ *
+ * Structure-of-arrays simulation state. Rovers and pois are views into these arrays.
+ *
+ */
+namespace rovers {
+
+struct AgentStore {
+    using Point = thyme::math::Point;
+
+    // agent types are small dense tags: worlds keep an observer count per entity and type
+    static constexpr std::size_t max_types = 64;
+
+    explicit AgentStore(std::size_t size = 0) { resize(size); }
+
+    std::size_t size() const { return position.size(); }
+    void resize(std::size_t size) {
+        position.resize(size);
+        obs_radius.resize(size, 1.0);
+        type.resize(size, 0);
+    }
+
+    std::vector<Point> position;
+    std::vector<double> obs_radius;
+    // small integer tag for heterogeneous teams, see TypeConstraint
+    std::vector<std::uint32_t> type;
+    // positions recorded by the environment once per step
+    Trajectory trajectory;
+};
+
+struct EntityStore {
+    using Point = thyme::math::Point;
+
+    explicit EntityStore(std::size_t size = 0) { resize(size); }
+
+    std::size_t size() const { return position.size(); }
+    void resize(std::size_t size) {
+        position.resize(size);
+        obs_radius.resize(size, 1.0);
+        value.resize(size, 1.0);
+        observed.resize(size, false);
+    }
+
+    std::vector<Point> position;
+    std::vector<double> obs_radius;
+    std::vector<double> value;
+    std::vector<char> observed;
+};
+
+/*
+ *
+ * Copy of the simulation state: positions, radii, values, observed flags, the random stream and
+ * the episode's step count and total reward. Paths share their recorded frames with the world
+ * (see Trajectory::Mark), so taking and restoring a snapshot barely depends on the episode length
+ * and restores the snapshot's path from any branch. State held by rover/poi components themselves
+ * is not included.
+ *
+ */
+struct Snapshot {
+    AgentStore agents;  // without path history, see trajectory
+    EntityStore entities;
+    Trajectory::Mark trajectory;
+    thyme::math::Rng rng;
+    // set by the environment, see StepInfo
+    std::size_t steps{0};
+    double total_reward{0.0};
+};
+
+/*
+ *
+ * Something within sensing range of an agent
+ *
+ */
+struct Neighbour {
+    std::size_t index;
+    double angle;  // degrees, as thyme::math::l2a
+    double distance;
+};
+
+/*
+ *
+ * State of all agents and entities in an environment
+ *
+ */
+struct World {
+    using Point = thyme::math::Point;
+    using Neighbours = thyme::utilities::Span<Neighbour>;
+
+    AgentStore agents;
+    EntityStore entities;
+
+    // spatial indices over agent and entity positions, rebuilt by the environment every step
+    thyme::spatial::UniformGrid agent_grid;
+    thyme::spatial::UniformGrid entity_grid;
+
+    // pairwise cache shared by sensors, constraints and rewards within a step:
+    // agents and entities within obs radius of each agent, agents within range of each entity
+    std::vector<std::vector<Neighbour>> agent_neighbours;
+    std::vector<std::vector<Neighbour>> entity_neighbours;
+    std::vector<std::size_t> observers;
+    // observers of each entity by agent type: (num_entities x num_types), row-major
+    std::vector<std::size_t> type_observers;
+    std::size_t num_types{1};
+
+    // entities whose observers changed (or were un-observed) since the last update
+    std::vector<char> dirty;
+    // entities that became observed this step (in index order), their total value and each
+    // agent's share of it (G - G without the agent). Set by the environment.
+    std::vector<std::size_t> newly_observed;
+    double global_reward{0.0};
+    std::vector<double> difference_rewards;
+
+    // random stream of this environment, for initialization and any component that needs one
+    thyme::math::Rng rng;
+
+    // unobserved entities in index order, as of the last update: loops over pois that are still
+    // in play shrink as the episode goes on
+    std::vector<std::size_t> active_entities;
+
+    // rebuilds the indices and the pairwise cache. Called by the environment once per step.
+    // Observer counts are only updated for agents that moved, unless entities changed.
+    void update() {
+        rebuild_index();
+
+        const std::size_t types =
+            agents.size() > 0 ? *std::max_element(agents.type.begin(), agents.type.end()) + 1 : 1;
+        if (types > AgentStore::max_types) throw std::out_of_range("agent type above max_types");
+        const bool recount = m_stale || entities_changed() ||
+                             agent_neighbours.size() != agents.size() || types != num_types;
+        num_types = types;
+        agent_neighbours.resize(agents.size());
+        entity_neighbours.resize(agents.size());
+        if (recount) {
+            observers.assign(entities.size(), 0);
+            type_observers.assign(entities.size() * num_types, 0);
+            for (auto& sensed_entities : entity_neighbours) sensed_entities.clear();
+            dirty.assign(entities.size(), true);
+        } else {
+            for (std::size_t j = 0; j < entities.size(); ++j)
+                dirty[j] = m_observed[j] && !entities.observed[j];
+        }
+        if (recount || entities.observed != m_observed) refresh_active();
+
+        for (std::size_t i = 0; i < agents.size(); ++i) {
+            const auto& position = agents.position[i];
+            const double& radius = agents.obs_radius[i];
+
+            auto& sensed_agents = agent_neighbours[i];
+            sensed_agents.clear();
+            agents_near(position, radius, [&](std::size_t j) {
+                auto [angle, distance] = thyme::math::l2a(position, agents.position[j]);
+                if (j != i && distance <= radius) sensed_agents.push_back({j, angle, distance});
+            });
+
+            if (!recount && !agent_changed(i)) continue;
+            // swap this agent's old observations for its new ones
+            auto& sensed_entities = entity_neighbours[i];
+            for (const auto& entity : sensed_entities) {
+                if (!observes(entity)) continue;
+                remove_observer(entity.index, m_agent_type[i]);
+                dirty[entity.index] = true;
+            }
+            sensed_entities.clear();
+            entities_near(position, radius, [&](std::size_t j) {
+                auto [angle, distance] = thyme::math::l2a(position, entities.position[j]);
+                if (distance > radius) return;
+                sensed_entities.push_back({j, angle, distance});
+                if (observes(sensed_entities.back())) {
+                    add_observer(j, agents.type[i]);
+                    dirty[j] = true;
+                }
+            });
+        }
+
+        m_agent_position = agents.position;
+        m_agent_radius = agents.obs_radius;
+        m_agent_type = agents.type;
+        m_entity_position = entities.position;
+        m_entity_radius = entities.obs_radius;
+        m_observed = entities.observed;
+        m_stale = false;
+    }
+
+    // copies into an existing snapshot reuse its storage
+    void snapshot(Snapshot& into) const {
+        into.agents.position = agents.position;
+        into.agents.obs_radius = agents.obs_radius;
+        into.agents.type = agents.type;
+        agents.trajectory.mark(into.trajectory);
+        into.entities = entities;
+        into.rng = rng;
+    }
+    // the next update recomputes every cache from the restored state
+    void restore(const Snapshot& from) {
+        assert(from.agents.size() == agents.size() && from.entities.size() == entities.size());
+        agents.position = from.agents.position;
+        agents.obs_radius = from.agents.obs_radius;
+        agents.type = from.agents.type;
+        agents.trajectory.rewind(from.trajectory);
+        entities = from.entities;
+        rng = from.rng;
+        m_stale = true;
+    }
+
+    // the next update recounts every observer, e.g. after rovers or pois were rebound
+    void invalidate() { m_stale = true; }
+
+    void rebuild_index() {
+        // cells the size of the largest sensing radius keep queries to a few cells
+        double cell_size = 1.0;
+        if (agents.size() > 0)
+            cell_size = *std::max_element(agents.obs_radius.begin(), agents.obs_radius.end());
+        agent_grid.build(agents.position, cell_size);
+        entity_grid.build(entities.position, cell_size);
+    }
+
+    // calls visit(index) for every agent/entity within radius of center
+    template <typename Visitor>
+    void agents_near(const Point& center, double radius, Visitor&& visit) const {
+        agent_grid.query(center, radius, std::forward<Visitor>(visit));
+    }
+    template <typename Visitor>
+    void entities_near(const Point& center, double radius, Visitor&& visit) const {
+        entity_grid.query(center, radius, std::forward<Visitor>(visit));
+    }
+
+    // cached agents/entities within obs radius of an agent
+    Neighbours sensed_agents(std::size_t agent) const { return agent_neighbours[agent]; }
+    Neighbours sensed_entities(std::size_t agent) const { return entity_neighbours[agent]; }
+
+    // whether the agent sensing an entity is one of its observers: within the entity's radius too.
+    // The observer counts hold exactly the sensed entities this is true for.
+    [[nodiscard]] bool observes(const Neighbour& sensed) const {
+        return sensed.distance <= entities.obs_radius[sensed.index];
+    }
+    // true if at least `count` agents are within observation range of the entity
+    [[nodiscard]] bool observed_by(std::size_t entity, std::size_t count) const {
+        return observers[entity] > 0 && observers[entity] >= count;
+    }
+    // agents of `type` within observation range of the entity
+    [[nodiscard]] std::size_t observers_of_type(std::size_t entity, std::size_t type) const {
+        return type < num_types ? type_observers[entity * num_types + type] : 0;
+    }
+
+    // counts an agent of `type` in/out of an entity's observers, e.g. to evaluate the entity
+    // without that agent
+    void add_observer(std::size_t entity, std::size_t type) {
+        ++observers[entity];
+        ++type_observers[entity * num_types + type];
+    }
+    void remove_observer(std::size_t entity, std::size_t type) {
+        --observers[entity];
+        --type_observers[entity * num_types + type];
+    }
+
+   private:
+    void refresh_active() {
+        active_entities.clear();
+        for (std::size_t j = 0; j < entities.size(); ++j)
+            if (!entities.observed[j]) active_entities.push_back(j);
+    }
+    static bool moved(const Point& a, const Point& b) { return a.x != b.x || a.y != b.y; }
+    bool agent_changed(std::size_t i) const {
+        return moved(agents.position[i], m_agent_position[i]) ||
+               agents.obs_radius[i] != m_agent_radius[i] || agents.type[i] != m_agent_type[i];
+    }
+    bool entities_changed() const {
+        if (m_entity_position.size() != entities.size()) return true;
+        for (std::size_t j = 0; j < entities.size(); ++j) {
+            if (moved(entities.position[j], m_entity_position[j]) ||
+                entities.obs_radius[j] != m_entity_radius[j])
+                return true;
+        }
+        return false;
+    }
+
+   private:
+    // state seen by the last update
+    std::vector<Point> m_agent_position;
+    std::vector<double> m_agent_radius;
+    std::vector<std::uint32_t> m_agent_type;
+    std::vector<Point> m_entity_position;
+    std::vector<double> m_entity_radius;
+    std::vector<char> m_observed;
+    bool m_stale{true};
+};
+
+}  // namespace rovers
+
+#endif
@@ -14,9 +14,15 @@ namespace rovers {
  */
 class CountConstraint {
    public:
+    // satisfaction only depends on the agents in range
+    static constexpr bool observer_driven = true;
+
     explicit CountConstraint(size_t count = 3) : count_constraint(count) {}
 
     [[nodiscard]] bool is_satisfied(const EntityPack& entity_pack) const {
+        if (entity_pack.world)
+            return entity_pack.world->observed_by(entity_pack.entity->index(), count_constraint);
+
         size_t count = 0;
         for (const auto& rover : entity_pack.agents) {
             double dist = l2_norm(rover->position(), entity_pack.entity->position());
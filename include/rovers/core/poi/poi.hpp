@@ -1,8 +1,12 @@
 #ifndef THYME_ENVIRONMENTS_ROVERS_POI
 #define THYME_ENVIRONMENTS_ROVERS_POI
 
+#include <memory>
 #include <rovers/core/detail/pack.hpp>
+#include <rovers/core/detail/world.hpp>
 #include <rovers/utilities/math/cartesian.hpp>
+#include <stdexcept>
+#include <type_traits>
 
 namespace rovers {
 
@@ -15,20 +19,35 @@ class IPOI {
     using Point = thyme::math::Point;
 
    public:
-    IPOI(double value, double obs_radius) : m_value(value), m_obs_radius(obs_radius) {}
+    IPOI(double value, double obs_radius) : m_store(std::make_shared<EntityStore>(1)) {
+        m_store->value[0] = value;
+        m_store->obs_radius[0] = obs_radius;
+    }
+    // copies get their own state
+    IPOI(const IPOI& other) : m_store(std::make_shared<EntityStore>(1)) {
+        m_store->position[0] = other.position();
+        m_store->value[0] = other.value();
+        m_store->obs_radius[0] = other.obs_radius();
+        m_store->observed[0] = other.observed();
+    }
+    IPOI(IPOI&&) noexcept = default;
     virtual ~IPOI() = default;
 
-    const Point& position() const { return m_position; }
+    const Point& position() const { return m_store->position[m_index]; }
     void set_position(double x, double y) {
-        m_position.x = x;
-        m_position.y = y;
+        auto& position = m_store->position[m_index];
+        position.x = x;
+        position.y = y;
     }
 
-    const double& value() const { return m_value; }
-    const double& obs_radius() const { return m_obs_radius; }
+    const double& value() const { return m_store->value[m_index]; }
+    const double& obs_radius() const { return m_store->obs_radius[m_index]; }
 
-    void set_observed(bool observed) { m_observed = observed; }
-    const bool& observed() const { return m_observed; }
+    void set_observed(bool observed) { m_store->observed[m_index] = observed; }
+    bool observed() const { return m_store->observed[m_index]; }
+
+    // slot in the state arrays of the owning environment
+    std::size_t index() const { return m_index; }
 
     void update() {
         // housekeeping.
@@ -37,18 +56,50 @@ class IPOI {
     }
 
     [[nodiscard]] virtual bool constraint_satisfied(const EntityPack&) const = 0;
+    // true if the constraint only changes when agents come in or out of range. The
+    // environment then only re-evaluates it when its observers change.
+    [[nodiscard]] virtual bool observer_driven() const { return false; }
 
    protected:
     virtual void tick() {}
 
    private:
-    Point m_position;
-    double m_value;
+    template <typename>
+    friend class Environment;
+
+    // moves this poi's state into slot `index` of a shared store. A poi belongs to one
+    // environment (and its copies) at a time.
+    void bind(std::shared_ptr<EntityStore> store, std::size_t index,
+              const std::shared_ptr<const void>& owner = nullptr) {
+        const auto current = m_owner.lock();
+        if (current && owner && current != owner)
+            throw std::invalid_argument("poi is already bound to another environment");
+        store->position[index] = position();
+        store->value[index] = value();
+        store->obs_radius[index] = obs_radius();
+        store->observed[index] = observed();
+        m_store = std::move(store);
+        m_index = index;
+        m_owner = owner;
+    }
+    // gives this poi its own state again
+    void unbind() { bind(std::make_shared<EntityStore>(1), 0); }
 
-    double m_obs_radius;
-    bool m_observed{false};
+   private:
+    std::shared_ptr<EntityStore> m_store;
+    std::size_t m_index{0};
+    std::weak_ptr<const void> m_owner;
 };
 
+namespace detail {
+// constraint policies declaring `static constexpr bool observer_driven = true`
+template <typename Constraint, typename = void>
+struct observer_driven : std::false_type {};
+template <typename Constraint>
+struct observer_driven<Constraint, std::void_t<decltype(Constraint::observer_driven)>>
+    : std::bool_constant<Constraint::observer_driven> {};
+}  // namespace detail
+
 /*
  *
  * Default boilerplate poi
@@ -64,6 +115,9 @@ class POI final : public IPOI {
     [[nodiscard]] bool constraint_satisfied(const EntityPack& entity_pack) const override {
         return m_constraint.is_satisfied(entity_pack);
     }
+    [[nodiscard]] bool observer_driven() const override {
+        return detail::observer_driven<ConstraintPolicy>::value;
+    }
 
    private:
     ConstraintPolicy m_constraint;
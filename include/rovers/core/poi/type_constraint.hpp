@@ -4,32 +4,65 @@
 #include <rovers/core/poi/poi.hpp>
 #include <rovers/core/rover/rover.hpp>
 #include <rovers/utilities/math/norms.hpp>
+#include <stdexcept>
+#include <vector>
 
 namespace rovers {
 
 /*
  *
- * Constraint satisfied by agents of a types observing together
+ * Constraint satisfied by agents of given types observing together: at least counts[t] agents
+ * of type t (see IRover::set_type)
  *
  */
 class TypeConstraint {
    public:
-    explicit TypeConstraint(size_t count = 3) : count_constraint(count) {}
+    // satisfaction only depends on the agents in range
+    static constexpr bool observer_driven = true;
+
+    // `count` agents of `type`
+    explicit TypeConstraint(size_t count = 3, size_t type = 0) {
+        if (type >= AgentStore::max_types) throw std::out_of_range("agent type above max_types");
+        m_counts.assign(type + 1, 0);
+        m_counts[type] = count;
+    }
+    explicit TypeConstraint(std::vector<size_t> counts) : m_counts(std::move(counts)) {
+        if (m_counts.size() > AgentStore::max_types)
+            throw std::out_of_range("more counts than max_types");
+    }
 
     [[nodiscard]] bool is_satisfied(const EntityPack& entity_pack) const {
-        size_t count = 0;
+        if (entity_pack.world) {
+            // per type observer counts kept by the world: one lookup per type
+            const auto& world = *entity_pack.world;
+            const std::size_t entity = entity_pack.entity->index();
+            if (world.observers[entity] == 0) return false;
+            for (size_t type = 0; type < m_counts.size(); ++type) {
+                if (world.observers_of_type(entity, type) < m_counts[type]) return false;
+            }
+            return true;
+        }
+
+        size_t observers = 0;
+        std::vector<size_t> counts(m_counts.size(), 0);
         for (const auto& rover : entity_pack.agents) {
             double dist = l2_norm(rover->position(), entity_pack.entity->position());
             if (dist <= rover->obs_radius() && dist <= entity_pack.entity->obs_radius()) {
-                ++count;
-                if (count >= count_constraint) return true;
+                ++observers;
+                if (rover->type() < counts.size()) ++counts[rover->type()];
             }
         }
-        return false;
+        if (observers == 0) return false;
+        for (size_t type = 0; type < m_counts.size(); ++type) {
+            if (counts[type] < m_counts[type]) return false;
+        }
+        return true;
     }
 
+    const std::vector<size_t>& counts() const { return m_counts; }
+
    private:
-    size_t count_constraint;
+    std::vector<size_t> m_counts;
 };
 
 }  // namespace rovers
@@ -14,10 +14,14 @@ namespace rovers::rewards {
 class Difference {
    public:
     [[nodiscard]] double compute(const AgentPack& pack) const {
+        // evaluated for all agents once per step by the environment
+        if (pack.world) return pack.world->difference_rewards[pack.agent->index()];
+
         double reward = Global().compute(pack);
         auto rovers_without_me = thyme::utilities::filter(
-            pack.agents, [&](const auto& rover) { return &rover != &pack.agent; });
-        double reward_without_me = Global().compute(pack);
+            pack.agents, [&](const auto& rover) { return rover.self_ != pack.agent.self_; });
+        double reward_without_me =
+            Global().compute(AgentPack::view(pack.agent, rovers_without_me, pack.entities));
 
         return reward - reward_without_me;
     }
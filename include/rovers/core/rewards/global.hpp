@@ -7,22 +7,22 @@ namespace rovers::rewards {
 
 /*
  *
- * Default environment reward: checks if all constraints are satisfied
+ * Default environment reward: value of the pois whose constraints are newly satisfied
  *
  */
 class Global {
    public:
     [[nodiscard]] double compute(const AgentPack& pack) const {
-        // TODO pass in a view of POIContainer filtered by observed()
-        // TODO Keep filtering over this view for speed-up
+        // evaluated once per step by the environment, over its unobserved pois only
+        // (World::active_entities)
+        if (pack.world) return pack.world->global_reward;
+
+        // standalone packs have no index of unobserved pois
         double reward = 0.0;
         for (const auto& poi : pack.entities) {
             if (poi->observed()) continue;
-
-            if (poi->constraint_satisfied({poi, pack.agents, pack.entities})) {
-                poi->set_observed(true);  // TDDO emit signal to POI instead.
+            if (poi->constraint_satisfied(EntityPack::view(poi, pack.agents, pack.entities)))
                 reward += poi->value();
-            }
         }
         return reward;
     }
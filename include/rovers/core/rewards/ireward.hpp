@@ -1,7 +1,10 @@
 #ifndef THYME_ENVIRONMENTS_ROVERS_IREWARD
 #define THYME_ENVIRONMENTS_ROVERS_IREWARD
 
+#include <Eigen/Dense>
 #include <rovers/core/detail/pack.hpp>
+#include <rovers/core/detail/world.hpp>
+#include <vector>
 
 namespace rovers::rewards {
 
@@ -13,6 +16,13 @@ namespace rovers::rewards {
 class IReward {
    public:
     [[nodiscard]] virtual double compute(const AgentPack&) const = 0;
+    // optional: rewards of all rovers whose reward has this class, one per entry of `agents`
+    // (indices into the world). Called once per step on one of those rewards.
+    // An empty matrix falls back to compute() for each rover.
+    [[nodiscard]] virtual Eigen::MatrixXd compute_batch(const World&,
+                                                        const std::vector<std::size_t>&) const {
+        return {};
+    }
     virtual ~IReward() = default;
 };
 
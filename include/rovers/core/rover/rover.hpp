@@ -2,12 +2,21 @@
 #define THYME_ENVIRONMENTS_ROVERS_ROVER
 
 #include <Eigen/Dense>
+#include <cassert>
 #include <iostream>
+#include <memory>
 #include <rovers/core/detail/agent_types.hpp>
 #include <rovers/core/detail/entity_types.hpp>
 #include <rovers/core/detail/pack.hpp>
+#include <rovers/core/detail/world.hpp>
 #include <rovers/core/rewards/global.hpp>
+#include <rovers/core/rewards/ireward.hpp>
+#include <rovers/core/sensors/isensor.hpp>
 #include <rovers/utilities/math/cartesian.hpp>
+#include <rovers/utilities/math/random.hpp>
+#include <stdexcept>
+#include <type_traits>
+#include <utility>
 #include <vector>
 
 namespace rovers {
@@ -23,24 +32,44 @@ class IRover {
     using StateType = Eigen::MatrixXd;
 
    public:
-    IRover(double obs_radius = 1.0) : m_obs_radius(obs_radius) {}
+    IRover(double obs_radius = 1.0) : m_store(std::make_shared<AgentStore>(1)) {
+        m_store->obs_radius[0] = obs_radius;
+    }
+    // copies get their own state
+    IRover(const IRover& other) : m_store(std::make_shared<AgentStore>(1)) {
+        m_store->position[0] = other.position();
+        m_store->obs_radius[0] = other.obs_radius();
+        m_store->type[0] = other.type();
+    }
+    IRover(IRover&&) noexcept = default;
     virtual ~IRover() = default;
 
-    void reset() { m_path.clear(); }
-
-    const Point& position() const { return m_position; }
+    const Point& position() const { return m_store->position[m_index]; }
     void set_position(double x, double y) {
-        m_position.x = x;
-        m_position.y = y;
-        m_path.push_back(Point(x, y));
+        auto& position = m_store->position[m_index];
+        position.x = x;
+        position.y = y;
     }
     void update_position (double dx, double dy){
-        set_position(m_position.x + dx, m_position.y + dy);
+        const auto& position = m_store->position[m_index];
+        set_position(position.x + dx, position.y + dy);
+    }
+
+    const double& obs_radius() const { return m_store->obs_radius[m_index]; }
+
+    // agent type, 0 unless set: which of a TypeConstraint's counts this rover adds to. Below
+    // AgentStore::max_types.
+    std::size_t type() const { return m_store->type[m_index]; }
+    void set_type(std::size_t type) {
+        if (type >= AgentStore::max_types) throw std::out_of_range("agent type above max_types");
+        m_store->type[m_index] = static_cast<std::uint32_t>(type);
     }
 
-    const double& obs_radius() const { return m_obs_radius; }
+    // slot in the state arrays of the owning environment
+    std::size_t index() const { return m_index; }
 
-    const std::vector<Point>& path() const { return m_path; }
+    // positions recorded so far this episode, as kept by the environment's path history
+    std::vector<Point> path() const { return m_store->trajectory.path(m_index); }
 
     void update() {
         // housekeeping.
@@ -51,6 +80,19 @@ class IRover {
     [[nodiscard]] virtual StateType scan(const AgentPack&) const = 0;
     [[nodiscard]] virtual double reward(const AgentPack&) const = 0;
 
+    // writes the state into a preallocated, zero padded column. Defaults to copying scan().
+    virtual void scan_into(const AgentPack& pack, Eigen::Ref<Eigen::VectorXd> state) const {
+        const StateType scanned = scan(pack);
+        assert(scanned.size() <= state.size());
+        state.head(scanned.size()) = Eigen::Map<const Eigen::VectorXd>(scanned.data(), scanned.size());
+        state.tail(state.size() - scanned.size()).setZero();
+    }
+
+    // sensor/reward whose scan_batch/compute_batch the environment calls once for all rovers
+    // using the same class. nullptr: always scan()/reward() per rover.
+    virtual const ISensor* batch_sensor() const { return nullptr; }
+    virtual const rewards::IReward* batch_reward() const { return nullptr; }
+
     // [TODO] temp cppyy super().__init__() fix
     virtual void act(const ActionType&) {}
 
@@ -58,11 +100,50 @@ class IRover {
     virtual void tick() {}
 
    private:
-    double m_obs_radius;
-    Point m_position;
-    std::vector<Point> m_path;
+    template <typename>
+    friend class Environment;
+
+    // moves this rover's state into slot `index` of a shared store. A rover belongs to one
+    // environment (and its copies) at a time.
+    void bind(std::shared_ptr<AgentStore> store, std::size_t index,
+              const std::shared_ptr<const void>& owner = nullptr) {
+        const auto current = m_owner.lock();
+        if (current && owner && current != owner)
+            throw std::invalid_argument("rover is already bound to another environment");
+        store->position[index] = position();
+        store->obs_radius[index] = obs_radius();
+        store->type[index] = type();
+        m_store = std::move(store);
+        m_index = index;
+        m_owner = owner;
+    }
+    // gives this rover its own state again
+    void unbind() { bind(std::make_shared<AgentStore>(1), 0); }
+    // called by the environment with a stream of its own, see Rover::action_space
+    virtual void seed_action_space(const thyme::math::Rng&) {}
+
+   private:
+    std::shared_ptr<AgentStore> m_store;
+    std::size_t m_index{0};
+    std::weak_ptr<const void> m_owner;
 };
 
+namespace detail {
+// sensors that can write straight into a state buffer
+template <typename Sensor, typename = void>
+struct scans_into : std::false_type {};
+template <typename Sensor>
+struct scans_into<Sensor, std::void_t<decltype(std::declval<const Sensor&>().scan_into(
+                              std::declval<const AgentPack&>(),
+                              std::declval<Eigen::VectorXd&>()))>> : std::true_type {};
+// action spaces that can draw from an environment's random stream
+template <typename Space, typename = void>
+struct seeds_with_rng : std::false_type {};
+template <typename Space>
+struct seeds_with_rng<Space, std::void_t<decltype(std::declval<Space&>().seed(
+                                 std::declval<const thyme::math::Rng&>()))>> : std::true_type {};
+}  // namespace detail
+
 /*
  *
  * Default boilerplate rover
@@ -74,15 +155,39 @@ class Rover final : public IRover {
     using RType = thyme::utilities::SharedWrap<RewardType>;
     using ActionType = Eigen::MatrixXd;
    public:
-    Rover(double obs_radius = 1.0, SType sensor = SensorType(), RType reward = RewardType())
-        : IRover(obs_radius), m_sensor(sensor), m_reward(reward) {}
+    Rover(double obs_radius = 1.0, SType sensor = SensorType(), RType reward = RewardType(),
+          ActionSpace action_space = ActionSpace())
+        : IRover(obs_radius), m_sensor(sensor), m_reward(reward), m_action_space(action_space) {}
+
+    // reseeded from the environment's random stream when the rover is bound and on env.seed()
+    ActionSpace& action_space() { return m_action_space; }
 
     [[nodiscard]] virtual Eigen::MatrixXd scan(const AgentPack& pack) const override {
         return m_sensor->scan(pack);
     }
+    void scan_into(const AgentPack& pack, Eigen::Ref<Eigen::VectorXd> state) const override {
+        // forwarded as a fresh map: copying an Eigen::Ref is deprecated
+        Eigen::Map<Eigen::VectorXd> column(state.data(), state.size());
+        if constexpr (detail::scans_into<SensorType>::value)
+            m_sensor->scan_into(pack, column);
+        else
+            IRover::scan_into(pack, column);
+    }
     [[nodiscard]] virtual double reward(const AgentPack& pack) const override {
         return m_reward->compute(pack);
     }
+    const ISensor* batch_sensor() const override {
+        if constexpr (std::is_base_of_v<ISensor, SensorType>)
+            return m_sensor.self_.get();
+        else
+            return nullptr;
+    }
+    const rewards::IReward* batch_reward() const override {
+        if constexpr (std::is_base_of_v<rewards::IReward, RewardType>)
+            return m_reward.self_.get();
+        else
+            return nullptr;
+    }
     void act(const ActionType& action) override {
         // default, move in x and y
         assert(action.rows() >= 2);
@@ -91,8 +196,13 @@ class Rover final : public IRover {
     }
 
    private:
+    void seed_action_space(const thyme::math::Rng& rng) override {
+        if constexpr (detail::seeds_with_rng<ActionSpace>::value) m_action_space.seed(rng);
+    }
+
     SType m_sensor;
     RType m_reward;
+    ActionSpace m_action_space;
 };
 
 /*
@@ -3,6 +3,8 @@
 
 #include <Eigen/Dense>
 #include <rovers/core/detail/pack.hpp>
+#include <rovers/core/detail/world.hpp>
+#include <vector>
 
 namespace rovers {
 
@@ -14,6 +16,13 @@ namespace rovers {
 class ISensor {
    public:
     [[nodiscard]] virtual Eigen::MatrixXd scan(const AgentPack& pack) const = 0;
+    // optional: states of all rovers whose sensor has this class, one column per entry of
+    // `agents` (indices into the world). Called once per step on one of those sensors.
+    // An empty matrix falls back to scan() for each rover.
+    [[nodiscard]] virtual Eigen::MatrixXd scan_batch(const World&,
+                                                     const std::vector<std::size_t>&) const {
+        return {};
+    }
     virtual ~ISensor() = default;
 };
 
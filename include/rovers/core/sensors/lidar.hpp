@@ -2,16 +2,36 @@
 #define THYME_ENVIRONMENTS_ROVERS_LIDAR
 
 #include <Eigen/Dense>
+#include <cassert>
+#include <limits>
 #include <numeric>
 #include <rovers/core/detail/pack.hpp>
 #include <rovers/core/poi/poi.hpp>
 #include <rovers/core/rover/rover.hpp>
 #include <rovers/utilities/math/norms.hpp>
 // #include <ranges> // changed for python branch
+#include <type_traits>
 #include <vector>
 
 namespace rovers {
 
+/*
+ *
+ * Running reading of a lidar sector
+ *
+ */
+struct SectorAccumulator {
+    double sum{0.0};
+    double max{std::numeric_limits<double>::lowest()};
+    std::size_t count{0};
+
+    inline void add(double value) {
+        sum += value;
+        max = std::max(max, value);
+        ++count;
+    }
+};
+
 /*
  *
  * Lidar composition strategies
@@ -24,6 +44,7 @@ class Density {
     inline Tp compose(const Range& range, Tp init, Up scale) const {
         return std::accumulate(std::begin(range), std::end(range), init) / scale;
     }
+    inline double reduce(const SectorAccumulator& sector) const { return sector.sum / sector.count; }
 };
 
 class Closest {
@@ -33,6 +54,7 @@ class Closest {
     inline Tp compose(const Range& range, Tp, Up) const {
         return *std::max_element(std::begin(range), std::end(range));
     }
+    inline double reduce(const SectorAccumulator& sector) const { return sector.max; }
 };
 
 /*
@@ -46,6 +68,15 @@ class ISensorComposition {
     virtual ~ISensorComposition() = default;
 };
 
+namespace detail {
+// composition policies with reduce() run on fixed accumulators, others get the sector readings
+template <typename Policy, typename = void>
+struct reduces : std::false_type {};
+template <typename Policy>
+struct reduces<Policy, std::void_t<decltype(std::declval<const Policy&>().reduce(
+                           std::declval<const SectorAccumulator&>()))>> : std::true_type {};
+}  // namespace detail
+
 /*
  *
  * Lidar
@@ -54,56 +85,94 @@ class ISensorComposition {
 template <typename CompositionPolicy = Density>
 class Lidar {
     using CPolicy = thyme::utilities::SharedWrap<CompositionPolicy>;
+    using Sector = std::conditional_t<detail::reduces<CompositionPolicy>::value, SectorAccumulator,
+                                      std::vector<double>>;
 
    public:
     Lidar(double resolution = 90, CPolicy composition_policy = CompositionPolicy())
-        : m_resolution(resolution), m_composition(composition_policy) {}
+        : m_resolution(resolution),
+          m_composition(composition_policy),
+          m_num_sectors(std::size_t(360 / resolution)) {}
 
     [[nodiscard]] Eigen::MatrixXd scan(const AgentPack& pack) const {
-        const std::size_t num_sectors = 360 / m_resolution;
-        std::vector<std::vector<double>> poi_values(num_sectors), rover_values(num_sectors);
-        auto& rover = pack.agent;  // convenient handle
-
-        // observe pois
-        for (const auto& sensed_poi : pack.entities) {
-            if (sensed_poi->observed()) continue;
-            auto [angle, distance] = thyme::math::l2a(rover->position(), sensed_poi->position());
-            if (distance > rover->obs_radius()) continue;
+        Eigen::MatrixXd state(m_num_sectors * 2, 1);
+        scan_into(pack, state.col(0));
+        return state;
+    }
 
-            int sector = angle / m_resolution;
-            poi_values[sector].push_back(sensed_poi->value() /
-                                         std::max(0.001, distance * distance));
+    // writes rover then poi sector readings (-1.0 when empty) into state, zero padding the rest.
+    // Sectors are per-thread scratch reused across scans: no allocation after the first scan,
+    // and lidars shared by rover copies can scan from several threads at once.
+    void scan_into(const AgentPack& pack, Eigen::Ref<Eigen::VectorXd> state) const {
+        const std::size_t num_sectors = m_num_sectors;
+        assert(state.size() >= Eigen::Index(num_sectors * 2));
+        static thread_local std::vector<Sector> rover_sectors, poi_sectors;
+        rover_sectors.resize(num_sectors);
+        poi_sectors.resize(num_sectors);
+        for (std::size_t i = 0; i < num_sectors; ++i) {
+            clear(rover_sectors[i]);
+            clear(poi_sectors[i]);
         }
 
-        // observe rovers
-        for (const auto& sensed_rover : pack.agents) {
-            if (&sensed_rover == &rover) continue;
-
-            auto [angle, distance] = thyme::math::l2a(rover->position(), sensed_rover->position());
-            if (distance > rover->obs_radius()) continue;
-
-            int sector = angle / m_resolution;
-            rover_values[sector].push_back(1.0 / std::max(0.001, distance * distance));
+        auto& rover = pack.agent;  // convenient handle
+        const auto& position = rover->position();
+        const double& obs_radius = rover->obs_radius();
+
+        auto sense = [&](auto& sectors, double angle, double distance, double value) {
+            std::size_t sector = std::min<std::size_t>(angle / m_resolution, num_sectors - 1);
+            add(sectors[sector], value / std::max(0.001, distance * distance));
+        };
+
+        if (pack.world) {
+            // angles and distances were computed once for this step
+            const auto& pois = pack.world->entities;
+            for (const auto& poi : pack.world->sensed_entities(rover->index())) {
+                if (!pois.observed[poi.index])
+                    sense(poi_sectors, poi.angle, poi.distance, pois.value[poi.index]);
+            }
+            for (const auto& other : pack.world->sensed_agents(rover->index()))
+                sense(rover_sectors, other.angle, other.distance, 1.0);
+        } else {
+            // observe pois
+            for (const auto& sensed_poi : pack.entities) {
+                if (sensed_poi->observed()) continue;
+                auto [angle, distance] = thyme::math::l2a(position, sensed_poi->position());
+                if (distance <= obs_radius)
+                    sense(poi_sectors, angle, distance, sensed_poi->value());
+            }
+            // observe rovers
+            for (const auto& sensed_rover : pack.agents) {
+                if (sensed_rover.self_ == rover.self_) continue;
+                auto [angle, distance] = thyme::math::l2a(position, sensed_rover->position());
+                if (distance <= obs_radius) sense(rover_sectors, angle, distance, 1.0);
+            }
         }
 
         // encode state
-        Eigen::MatrixXd state(num_sectors * 2, 1);
-
         for (std::size_t i = 0; i < num_sectors; ++i) {
-            const std::size_t& num_rovers = rover_values[i].size();
-            const std::size_t& num_poi = poi_values[i].size();
-            state(i) = state(num_sectors + i) = -1.0;
-
-            if (num_rovers > 0) state(i) = m_composition->compose(rover_values[i], 0.0, num_rovers);
-            if (num_poi > 0)
-                state(num_sectors + i) = m_composition->compose(poi_values[i], 0.0, num_poi);
+            state(i) = compose(rover_sectors[i]);
+            state(num_sectors + i) = compose(poi_sectors[i]);
         }
-        return state;
+        state.tail(state.size() - num_sectors * 2).setZero();
+    }
+
+   private:
+    static inline void clear(SectorAccumulator& sector) { sector = SectorAccumulator(); }
+    static inline void clear(std::vector<double>& sector) { sector.clear(); }
+    static inline void add(SectorAccumulator& sector, double value) { sector.add(value); }
+    static inline void add(std::vector<double>& sector, double value) { sector.push_back(value); }
+
+    inline double compose(const SectorAccumulator& sector) const {
+        return sector.count > 0 ? m_composition->reduce(sector) : -1.0;
+    }
+    inline double compose(const std::vector<double>& sector) const {
+        return sector.empty() ? -1.0 : m_composition->compose(sector, 0.0, sector.size());
     }
 
    private:
     double m_resolution;
     CPolicy m_composition;
+    std::size_t m_num_sectors;
 };
 }  // namespace rovers
 
@@ -52,7 +52,6 @@ class CornersInit {
     // template <std::ranges::range POIContainer>
     template <typename POIContainer>
     void initialize_poi(POIContainer& pois) {
-        pois.size();
         const double start = 0.0;
         const double end = m_span - 1.0;
         double x, y;
@@ -1,37 +1,148 @@
 #ifndef THYME_ENVIRONMENTS_ROVERS_INIT_RANDOM
 #define THYME_ENVIRONMENTS_ROVERS_INIT_RANDOM
 
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <rovers/utilities/math/cartesian.hpp>
+#include <rovers/utilities/math/random.hpp>
+#include <vector>
+
 namespace rovers {
 
 /*
  *
- * Random agent/entity initialization stub
+ * How RandomInit scatters agents or entities over the world
+ *
+ */
+struct Placement {
+    enum Kind { Uniform, Clustered, PoissonDisk };
+
+    static Placement uniform() { return {Uniform, 0, 0.0, 0.0}; }
+    // normally distributed around `clusters` uniformly placed centers
+    static Placement clustered(std::size_t clusters, double spread) {
+        return {Clustered, std::max<std::size_t>(clusters, 1), spread, 0.0};
+    }
+    // uniform, at least `separation` apart while the world has room for it
+    static Placement poisson_disk(double separation) { return {PoissonDisk, 0, 0.0, separation}; }
+
+    Kind kind;
+    std::size_t clusters;
+    double spread;
+    double separation;
+};
+
+/*
+ *
+ * Random agent/entity initialization over a (width x height) world
  *
  */
 class RandomInit {
+    using Point = thyme::math::Point;
+
    public:
-    RandomInit() = default;
+    RandomInit(double width = 10.0, double height = 10.0, Placement rovers = Placement::uniform(),
+               Placement pois = Placement::uniform(), std::uint64_t seed = 0)
+        : m_width(width), m_height(height), m_rovers(rovers), m_pois(pois), m_rng(seed) {}
 
+    // standalone: draws from this policy's own generator
     template <typename RoverContainer, typename POIContainer>
     void initialize(RoverContainer& rovers, POIContainer& pois) {
-        initialize_rovers(rovers);
-        initialize_poi(pois);
+        initialize(rovers, pois, m_rng);
+    }
+    // in an environment: draws from the environment's random stream
+    template <typename RoverContainer, typename POIContainer>
+    void initialize(RoverContainer& rovers, POIContainer& pois, thyme::math::Rng& rng) {
+        place(m_rovers, rovers, rng);
+        place(m_pois, pois, rng);
+    }
+
+    // all positions are generated in one pass, then written
+    template <typename Container>
+    void place(const Placement& placement, Container& items, thyme::math::Rng& rng) {
+        m_points.resize(items.size());
+        switch (placement.kind) {
+            case Placement::Uniform:
+                uniform(rng);
+                break;
+            case Placement::Clustered:
+                clustered(placement, rng);
+                break;
+            case Placement::PoissonDisk:
+                poisson_disk(placement, rng);
+                break;
+        }
+        for (std::size_t i = 0; i < items.size(); ++i)
+            items[i]->set_position(m_points[i].x, m_points[i].y);
     }
 
    private:
-    template <typename RoverContainer>
-    void initialize_rovers(RoverContainer& rovers) {
-        for (std::size_t i = 0; i < rovers.size(); ++i) {
-            rovers[i].position = {0.0, 0.0};
+    void uniform(thyme::math::Rng& rng, std::size_t from = 0) {
+        for (std::size_t i = from; i < m_points.size(); ++i)
+            m_points[i] = {rng.uniform(0.0, m_width), rng.uniform(0.0, m_height)};
+    }
+
+    void clustered(const Placement& placement, thyme::math::Rng& rng) {
+        m_centers.resize(placement.clusters);
+        for (auto& center : m_centers)
+            center = {rng.uniform(0.0, m_width), rng.uniform(0.0, m_height)};
+        for (auto& point : m_points) {
+            const auto& center = m_centers[rng.integer(m_centers.size())];
+            point = {std::clamp(rng.normal(center.x, placement.spread), 0.0, m_width),
+                     std::clamp(rng.normal(center.y, placement.spread), 0.0, m_height)};
         }
     }
-    template <typename POIContainer>
-    void initialize_poi(POIContainer& pois) {
-        for (std::size_t i = 0; i < pois.size(); ++i) {
-            pois[i].position = {0.0, 0.0};
+
+    // dart throwing over a background grid of (separation / sqrt(2)) cells: at most one point
+    // per cell, so a candidate only checks the 5x5 cells around it. When darts keep missing the
+    // world is too full for the separation and the rest are placed uniformly.
+    void poisson_disk(const Placement& placement, thyme::math::Rng& rng) {
+        const double separation = placement.separation;
+        if (separation <= 0.0 || m_points.empty()) return uniform(rng);
+
+        const double cell = separation / std::sqrt(2.0);
+        const long cols = std::floor(m_width / cell) + 1, rows = std::floor(m_height / cell) + 1;
+        m_cells.assign(cols * rows, -1);
+
+        const double separation2 = separation * separation;
+        const std::size_t max_attempts = 30 * m_points.size();
+        std::size_t placed = 0;
+        for (std::size_t attempt = 0; attempt < max_attempts && placed < m_points.size();
+             ++attempt) {
+            const Point candidate(rng.uniform(0.0, m_width), rng.uniform(0.0, m_height));
+            const long col = candidate.x / cell, row = candidate.y / cell;
+            bool free = true;
+            for (long r = std::max(0L, row - 2); free && r <= std::min(rows - 1, row + 2); ++r) {
+                for (long c = std::max(0L, col - 2); c <= std::min(cols - 1, col + 2); ++c) {
+                    const long other = m_cells[r * cols + c];
+                    if (other < 0) continue;
+                    const double x = m_points[other].x - candidate.x;
+                    const double y = m_points[other].y - candidate.y;
+                    if (x * x + y * y < separation2) {
+                        free = false;
+                        break;
+                    }
+                }
+            }
+            if (!free) continue;
+            m_cells[row * cols + col] = placed;
+            m_points[placed++] = candidate;
         }
+        uniform(rng, placed);
     }
+
+   private:
+    double m_width;
+    double m_height;
+    Placement m_rovers;
+    Placement m_pois;
+    thyme::math::Rng m_rng;
+
+    // scratch, reused across resets
+    std::vector<Point> m_points;
+    std::vector<Point> m_centers;
+    std::vector<long> m_cells;
 };
-}  // namespace thyme::environments::rovers
+}  // namespace rovers
 
-#endif
\ No newline at end of file
+#endif
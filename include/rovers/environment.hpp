@@ -2,18 +2,51 @@
 #define THYME_ENVIRONMENTS_ROVERS_ENVIRONMENT
 
 #include <Eigen/Dense>
+#include <algorithm>
+#include <cassert>
+#include <cstdint>
+#include <memory>
+#include <rovers/core/detail/profiler.hpp>
+#include <rovers/core/detail/recorder.hpp>
+#include <rovers/core/detail/world.hpp>
 #include <rovers/core/poi/count_constraint.hpp>
 #include <rovers/core/poi/poi.hpp>
 #include <rovers/core/poi/type_constraint.hpp>
 #include <rovers/core/rover/rover.hpp>
 #include <rovers/core/sensors/lidar.hpp>
 #include <rovers/core/setup/init_random.hpp>
+#include <rovers/utilities/ranges.hpp>
 #include <rovers/utilities/spaces/discrete.hpp>
+#include <string>
 #include <tuple>
+#include <type_traits>
+#include <typeindex>
 #include <vector>
 
 namespace rovers {
 
+namespace detail {
+// initialization policies that draw from the environment's random stream
+template <typename Policy, typename = void>
+struct initializes_with_rng : std::false_type {};
+template <typename Policy>
+struct initializes_with_rng<Policy, std::void_t<decltype(std::declval<Policy&>().initialize(
+                                        std::declval<std::vector<Agent>&>(),
+                                        std::declval<std::vector<Entity>&>(),
+                                        std::declval<thyme::math::Rng&>()))>> : std::true_type {};
+}  // namespace detail
+
+/*
+ *
+ * What the last step()/reset() did, see Environment::info()
+ *
+ */
+struct StepInfo {
+    std::size_t steps{0};                     // steps since the last reset
+    std::vector<std::size_t> newly_observed;  // pois that became observed
+    double total_reward{0.0};                 // sum of all rover rewards since the last reset
+};
+
 /*
  *
  * Default Rovers environment
@@ -25,47 +58,139 @@ class Environment {
     using Action = Eigen::MatrixXd;
     using State = std::vector<Eigen::MatrixXd>;
     using Reward = std::vector<double>;
+    // column i holds the state of rover i: a row-major (num_rovers x state_size) array
+    using StateBuffer = Eigen::MatrixXd;
+    using RewardBuffer = Eigen::VectorXd;
 
     Environment(InitPolicy initPolicy = InitPolicy(), std::vector<Agent> rovers = {},
                 std::vector<Entity> pois = {}, size_t width = 10.0, size_t height = 10.0)
         : m_initPolicy(initPolicy),
           m_rovers(std::move(rovers)),
           m_pois(std::move(pois)),
+          m_world(std::make_shared<World>()),
           m_width(width),
-          m_height(height) {}
+          m_height(height) {
+        bind_rovers();
+        bind_pois();
+    }
 
     // helpers to set rovers/pois after the fact
-    void set_rovers(std::vector<Agent> rovers) { m_rovers = std::move(rovers); }
-    void set_pois(std::vector<Entity> pois) { m_pois = std::move(pois); }
+    void set_rovers(std::vector<Agent> rovers) {
+        for (auto& rover : m_rovers) rover->unbind();
+        m_rovers = std::move(rovers);
+        bind_rovers();
+    }
+    void set_pois(std::vector<Entity> pois) {
+        for (auto& poi : m_pois) poi->unbind();
+        m_pois = std::move(pois);
+        bind_pois();
+    }
 
     const std::vector<Agent>& rovers() { return m_rovers; }
     const std::vector<Entity>& pois() { return m_pois; }
+    const World& world() const { return *m_world; }
+
+    // opt-in: step()/reset() write into preallocated state and reward buffers and return empty
+    // containers. Rover states shorter than the longest one are zero padded.
+    void set_buffered(bool buffered) { m_buffered = buffered; }
+    const bool& buffered() const { return m_buffered; }
+    const StateBuffer& state_buffer() const { return m_state_buffer; }
+    const RewardBuffer& reward_buffer() const { return m_reward_buffer; }
+
+    // how many rover positions to keep: none, the last `length` steps or the whole episode
+    void set_path_history(PathHistory history, std::size_t length = 0) {
+        m_world->agents.trajectory.configure(history, length);
+    }
+    const Trajectory& trajectory() const { return m_world->agents.trajectory; }
+
+    // captures/restores the simulation state (see Snapshot), e.g. to branch episodes. Restoring
+    // into the same rovers and pois copies into the existing arrays without reallocating.
+    Snapshot snapshot() const {
+        Snapshot snapshot;
+        this->snapshot(snapshot);
+        return snapshot;
+    }
+    void snapshot(Snapshot& into) const {
+        m_world->snapshot(into);
+        into.steps = m_info.steps;
+        into.total_reward = m_info.total_reward;
+    }
+    void restore(const Snapshot& snapshot) {
+        m_world->restore(snapshot);
+        m_info.steps = snapshot.steps;
+        m_info.total_reward = snapshot.total_reward;
+        m_info.newly_observed.clear();
+        update_termination();
+    }
+
+    // the environment's random stream: the same seed and stream reproduce the same episodes,
+    // including what the rovers' action spaces sample
+    void seed(std::uint64_t seed, std::uint64_t stream = 0) {
+        m_world->rng.seed(seed, stream);
+        seed_action_spaces();
+    }
+    thyme::math::Rng& rng() { return m_world->rng; }
+
+    // time spent in each phase of step()/reset(), when built with -DROVERS_PROFILE
+    Profiler& profiler() { return m_profiler; }
+
+    // episodes are done once every poi is observed (unless disabled) and truncated after
+    // max_steps steps (0: no limit). Both are computed in step()/reset(): read them with
+    // done()/truncated() next to the returned states and rewards.
+    void set_max_steps(std::size_t max_steps) { m_max_steps = max_steps; }
+    void set_done_when_all_observed(bool enabled) { m_done_when_all_observed = enabled; }
+    const std::size_t& max_steps() const { return m_max_steps; }
+    bool done() const { return m_done; }
+    bool truncated() const { return m_truncated; }
+    const StepInfo& info() const { return m_info; }
+
+    // whether every component is a C++ library type. The python bindings set it on construction
+    // and then release the GIL during step()/reset() and let VecEnvironment use worker threads;
+    // set it to false to keep the GIL held and step on the calling thread.
+    void set_native(bool native) { m_native = native; }
+    bool native() const { return m_native; }
+
+    // streams every reset and step to an episode file (see Recorder) until stop_recording(),
+    // which flushes and closes it. Copies of a recording environment write to the same file.
+    void record(const std::string& path, std::size_t action_dim = 2) {
+        m_recorder = std::make_shared<Recorder>(path, action_dim);
+    }
+    void stop_recording() { m_recorder.reset(); }
 
     std::tuple<State, Reward> step(std::vector<Action> actions) {
-        for (size_t i = 0; i < m_rovers.size(); ++i) {
-            auto& rover = m_rovers[i];
-            // call update for all rovers
-            rover->update();
-            // take actions
-            rover->act(actions[i]);
-            // bound position
-            clamp_bounds(rover);
-        }
-        // call update for pois
-        for (auto& poi : m_pois) poi->update();
-        // return next observations and rewards
-        return status();
+        for (size_t i = 0; i < m_rovers.size(); ++i) act(i, actions[i]);
+        return end_step();
+    }
+    // actions as one row-major (num_rovers x action_dim) buffer, e.g. a numpy array: row i is
+    // rover i's action. Rows are read into per-rover matrices that are reused across steps.
+    std::tuple<State, Reward> step(const double* actions, std::size_t action_dim) {
+        return step_rows(actions, action_dim);
+    }
+    std::tuple<State, Reward> step(const float* actions, std::size_t action_dim) {
+        return step_rows(actions, action_dim);
     }
 
     std::tuple<State, Reward> reset() {
-        // clear agents
-        for (auto& r : m_rovers) r->reset();
         // reset pois
         for (auto& poi : m_pois) poi->set_observed(false);
         // initialize
-        m_initPolicy.initialize(m_rovers, m_pois);
+        {
+            const auto scope = m_profiler.time(Profiler::Reset);
+            if constexpr (detail::initializes_with_rng<InitPolicy>::value)
+                m_initPolicy.initialize(m_rovers, m_pois, m_world->rng);
+            else
+                m_initPolicy.initialize(m_rovers, m_pois);
+        }
+        // clear agents' paths
+        m_world->agents.trajectory.clear();
+        m_world->agents.trajectory.record(m_world->agents.position);
+        if (m_recorder) m_recorder->begin_episode();
+        m_info.steps = 0;
+        m_info.total_reward = 0.0;
         // return next observations and rewards
-        return status();
+        auto result = status();
+        update_termination();
+        return result;
     }
 
     void render() {}
@@ -76,26 +201,318 @@ class Environment {
     // TODO add pre/post update for all components
 
    private:
+    inline void act(std::size_t i, const Action& action) {
+        auto& rover = m_rovers[i];
+        // call update for all rovers
+        {
+            const auto scope = m_profiler.time_rover(Profiler::RoverUpdate, i);
+            rover->update();
+        }
+        // take actions
+        {
+            const auto scope = m_profiler.time_rover(Profiler::Act, i);
+            rover->act(action);
+        }
+        if (m_recorder) m_recorder->set_action(i, action);
+        // bound position
+        const auto scope = m_profiler.time_rover(Profiler::Clamp, i);
+        clamp_bounds(rover);
+    }
+    template <typename Scalar>
+    std::tuple<State, Reward> step_rows(const Scalar* actions, std::size_t action_dim) {
+        m_actions.resize(m_rovers.size());
+        for (size_t i = 0; i < m_rovers.size(); ++i) {
+            auto& action = m_actions[i];
+            action.resize(action_dim, 1);
+            const Scalar* row = actions + i * action_dim;
+            for (std::size_t k = 0; k < action_dim; ++k) action(k) = row[k];
+            act(i, action);
+        }
+        return end_step();
+    }
+    std::tuple<State, Reward> end_step() {
+        m_world->agents.trajectory.record(m_world->agents.position);
+        // call update for pois
+        for (std::size_t i = 0; i < m_pois.size(); ++i) {
+            const auto scope = m_profiler.time_poi(Profiler::PoiUpdate, i);
+            m_pois[i]->update();
+        }
+        // return next observations and rewards
+        auto result = status();
+        ++m_info.steps;
+        if (m_buffered) {
+            m_info.total_reward += m_reward_buffer.sum();
+        } else {
+            for (const auto& reward : std::get<1>(result)) m_info.total_reward += reward;
+        }
+        update_termination();
+        return result;
+    }
+    void update_termination() {
+        const auto& observed = m_world->entities.observed;
+        m_done = m_done_when_all_observed && !observed.empty() &&
+                 std::find(observed.begin(), observed.end(), false) == observed.end();
+        m_truncated = m_max_steps > 0 && m_info.steps >= m_max_steps;
+    }
+
+    // rovers and pois read and write their state through the world's arrays. New components may
+    // sit where the old ones were: the world's incremental state is recomputed either way.
+    void bind_rovers() {
+        m_world->invalidate();
+        // sized again from the new rovers' states on the next buffered step/reset
+        m_state_buffer.resize(0, 0);
+        m_reward_buffer.resize(0);
+        m_world->agents.resize(m_rovers.size());
+        m_profiler.resize(m_rovers.size(), m_pois.size());
+        std::shared_ptr<AgentStore> store(m_world, &m_world->agents);
+        for (std::size_t i = 0; i < m_rovers.size(); ++i) m_rovers[i]->bind(store, i, m_owner);
+        seed_action_spaces();
+    }
+    // rover i's action space draws from stream i of a seed taken from a copy of the environment's
+    // stream, so seeding them does not shift the environment's own draws
+    void seed_action_spaces() {
+        const std::uint64_t seed = thyme::math::Rng(m_world->rng)();
+        for (std::size_t i = 0; i < m_rovers.size(); ++i)
+            m_rovers[i]->seed_action_space(thyme::math::Rng(seed, i));
+    }
+    void bind_pois() {
+        m_world->invalidate();
+        m_world->entities.resize(m_pois.size());
+        m_profiler.resize(m_rovers.size(), m_pois.size());
+        std::shared_ptr<EntityStore> store(m_world, &m_world->entities);
+        m_observer_driven.resize(m_pois.size());
+        for (std::size_t i = 0; i < m_pois.size(); ++i) {
+            m_pois[i]->bind(store, i, m_owner);
+            m_observer_driven[i] = m_pois[i]->observer_driven();
+        }
+    }
+
     inline void clamp_bounds(Agent& rover) {
-        rover->set_position(std::clamp(rover->position().x, 0.0, 1.0 * m_width),
-                            std::clamp(rover->position().y, 0.0, 1.0 * m_height));
+        const auto& position = rover->position();
+        const double x = std::clamp(position.x, 0.0, 1.0 * m_width);
+        const double y = std::clamp(position.y, 0.0, 1.0 * m_height);
+        if (x != position.x || y != position.y) rover->set_position(x, y);
     }
 
     std::tuple<State, Reward> status() {
+        {
+            const auto scope = m_profiler.time(Profiler::World);
+            m_world->update();
+        }
+        evaluate_pois();
+        {
+            const auto scope = m_profiler.time(Profiler::Batches);
+            evaluate_batches();
+        }
+        if (m_buffered) {
+            status_into_buffers();
+            commit_observed();
+            if (m_recorder)
+                m_recorder->write(
+                    *m_world, [&](std::size_t i) { return m_state_buffer.col(i); },
+                    [&](std::size_t i) { return m_reward_buffer(i); });
+            return {};
+        }
         // observations and rewards
         State state;
         Reward rewards;
-        for (auto& r : m_rovers) {
-            state.push_back(r->scan({r, m_rovers, m_pois}));
-            rewards.push_back(r->reward({r, m_rovers, m_pois}));
+        for (std::size_t i = 0; i < m_rovers.size(); ++i) {
+            auto& r = m_rovers[i];
+            const auto pack = AgentPack::view(r, m_rovers, m_pois, m_world.get());
+            if (m_batched_state[i]) {
+                state.push_back(m_batch_states[i]);
+            } else {
+                const auto scope = m_profiler.time_rover(Profiler::Scan, i);
+                state.push_back(r->scan(pack));
+            }
+            if (m_batched_reward[i]) {
+                rewards.push_back(m_batch_rewards[i]);
+            } else {
+                const auto scope = m_profiler.time_rover(Profiler::Reward, i);
+                rewards.push_back(r->reward(pack));
+            }
         }
+        commit_observed();
+        if (m_recorder)
+            m_recorder->write(
+                *m_world, [&](std::size_t i) -> const Eigen::MatrixXd& { return state[i]; },
+                [&](std::size_t i) { return rewards[i]; });
         return {state, rewards};
     }
 
+    // finds the pois observed this step, once for all rewards. Only unobserved pois are visited;
+    // those with observer driven constraints are skipped until their observers change.
+    void evaluate_pois() {
+        auto& world = *m_world;
+        world.newly_observed.clear();
+        world.global_reward = 0.0;
+        for (const auto& i : world.active_entities) {
+            if (m_observer_driven[i] && !world.dirty[i]) continue;
+
+            const auto scope = m_profiler.time_poi(Profiler::Constraints, i);
+            const auto& poi = m_pois[i];
+            if (poi->constraint_satisfied(EntityPack::view(poi, m_rovers, m_pois, m_world.get()))) {
+                world.newly_observed.push_back(i);
+                world.global_reward += world.entities.value[i];
+            }
+        }
+        evaluate_counterfactuals();
+    }
+    // difference rewards for all rovers: a newly observed poi counts towards a rover's reward
+    // if it would not have been observed without that rover
+    void evaluate_counterfactuals() {
+        auto& world = *m_world;
+        world.difference_rewards.assign(m_rovers.size(), 0.0);
+        bool observer_driven = false;
+        for (const auto& i : world.newly_observed) {
+            if (m_observer_driven[i]) {
+                observer_driven = true;
+                continue;
+            }
+            const auto scope = m_profiler.time_poi(Profiler::Constraints, i);
+            const auto& poi = m_pois[i];
+            for (std::size_t r = 0; r < m_rovers.size(); ++r) {
+                auto rovers_without = thyme::utilities::filter(
+                    m_rovers, [&](const Agent& rover) { return rover.self_ != m_rovers[r].self_; });
+                if (!poi->constraint_satisfied(EntityPack::view(poi, rovers_without, m_pois)))
+                    world.difference_rewards[r] += world.entities.value[i];
+            }
+        }
+        if (!observer_driven) return;
+
+        // only observers matter: take each one out of the count in turn. The observers are those
+        // the world counted, read from its cache rather than measured again.
+        for (std::size_t r = 0; r < m_rovers.size(); ++r) {
+            for (const auto& sensed : world.sensed_entities(r)) {
+                const std::size_t i = sensed.index;
+                if (!m_observer_driven[i] || !world.observes(sensed) ||
+                    !std::binary_search(world.newly_observed.begin(), world.newly_observed.end(), i))
+                    continue;
+                const auto scope = m_profiler.time_poi(Profiler::Constraints, i);
+                const auto& poi = m_pois[i];
+                world.remove_observer(i, world.agents.type[r]);
+                if (!poi->constraint_satisfied(EntityPack::view(poi, m_rovers, m_pois, m_world.get())))
+                    world.difference_rewards[r] += world.entities.value[i];
+                world.add_observer(i, world.agents.type[r]);
+            }
+        }
+    }
+    // one scan_batch/compute_batch call for each sensor/reward class that implements them
+    void evaluate_batches() {
+        m_batched_state.assign(m_rovers.size(), false);
+        m_batched_reward.assign(m_rovers.size(), false);
+        m_batch_states.resize(m_rovers.size());
+        m_batch_rewards.resize(m_rovers.size());
+
+        for (const auto& [sensor, agents] : batch_groups(&IRover::batch_sensor)) {
+            const Eigen::MatrixXd states = sensor->scan_batch(*m_world, agents);
+            if (states.cols() != Eigen::Index(agents.size())) continue;
+            for (std::size_t k = 0; k < agents.size(); ++k) {
+                m_batch_states[agents[k]] = states.col(k);
+                m_batched_state[agents[k]] = true;
+            }
+        }
+        for (const auto& [reward, agents] : batch_groups(&IRover::batch_reward)) {
+            const Eigen::MatrixXd rewards = reward->compute_batch(*m_world, agents);
+            if (rewards.size() != Eigen::Index(agents.size())) continue;
+            for (std::size_t k = 0; k < agents.size(); ++k) {
+                m_batch_rewards[agents[k]] = rewards(k);
+                m_batched_reward[agents[k]] = true;
+            }
+        }
+    }
+    // rovers grouped by the class of their batch component, with the first rover's component
+    template <typename Component>
+    std::vector<std::pair<const Component*, std::vector<std::size_t>>> batch_groups(
+        const Component* (IRover::*component)() const) const {
+        std::vector<std::pair<const Component*, std::vector<std::size_t>>> groups;
+        std::vector<std::type_index> types;
+        for (std::size_t i = 0; i < m_rovers.size(); ++i) {
+            const Component* c = (*m_rovers[i].self_.*component)();
+            if (!c) continue;
+            const std::type_index type(typeid(*c));
+            auto it = std::find(types.begin(), types.end(), type);
+            if (it == types.end()) {
+                types.push_back(type);
+                groups.push_back({c, {}});
+                it = types.end() - 1;
+            }
+            groups[it - types.begin()].second.push_back(i);
+        }
+        return groups;
+    }
+
+    // pois are marked observed after sensors and rewards have seen the step
+    void commit_observed() {
+        for (const auto& i : m_world->newly_observed) m_pois[i]->set_observed(true);
+        m_info.newly_observed = m_world->newly_observed;
+    }
+
+    void status_into_buffers() {
+        if (m_state_buffer.cols() != Eigen::Index(m_rovers.size())) {
+            // size the buffers once from the longest state
+            Eigen::Index state_size = 0;
+            for (auto& r : m_rovers) {
+                const auto pack = AgentPack::view(r, m_rovers, m_pois, m_world.get());
+                state_size = std::max(state_size, r->scan(pack).size());
+            }
+            m_state_buffer.setZero(state_size, m_rovers.size());
+            m_reward_buffer.setZero(m_rovers.size());
+        }
+        for (std::size_t i = 0; i < m_rovers.size(); ++i) {
+            auto& r = m_rovers[i];
+            const auto pack = AgentPack::view(r, m_rovers, m_pois, m_world.get());
+            if (m_batched_state[i]) {
+                const auto& batched = m_batch_states[i];
+                assert(batched.size() <= m_state_buffer.rows());
+                const Eigen::Index size = batched.size();
+                m_state_buffer.block(0, i, size, 1) = batched;
+                m_state_buffer.block(size, i, m_state_buffer.rows() - size, 1).setZero();
+            } else {
+                const auto scope = m_profiler.time_rover(Profiler::Scan, i);
+                r->scan_into(pack, m_state_buffer.col(i));
+            }
+            if (m_batched_reward[i]) {
+                m_reward_buffer(i) = m_batch_rewards[i];
+            } else {
+                const auto scope = m_profiler.time_rover(Profiler::Reward, i);
+                m_reward_buffer(i) = r->reward(pack);
+            }
+        }
+    }
+
    private:
     InitPolicy m_initPolicy;
     std::vector<Agent> m_rovers;
     std::vector<Entity> m_pois;
+    std::shared_ptr<World> m_world;
+    // held only by this environment and its copies: while one lives, its rovers and pois cannot
+    // be bound to another environment
+    std::shared_ptr<const void> m_owner{std::make_shared<char>()};
+    std::vector<char> m_observer_driven;
+
+    bool m_buffered{false};
+    StateBuffer m_state_buffer;
+    RewardBuffer m_reward_buffer;
+
+    // this step's results from scan_batch/compute_batch, by rover
+    std::vector<char> m_batched_state;
+    std::vector<char> m_batched_reward;
+    State m_batch_states;
+    Reward m_batch_rewards;
+    // actions read from a step() buffer
+    std::vector<Action> m_actions;
+
+    Profiler m_profiler;
+    std::shared_ptr<Recorder> m_recorder;
+
+    bool m_native{true};
+
+    std::size_t m_max_steps{0};
+    bool m_done_when_all_observed{true};
+    bool m_done{false};
+    bool m_truncated{false};
+    StepInfo m_info;
 
     size_t m_width;
     size_t m_height;
@@ -113,6 +530,10 @@ using Actions = std::vector<Eigen::MatrixXd>;
 Eigen::MatrixXd tensor(std::vector<double> list) {
     return Eigen::Map<Eigen::MatrixXd>(list.data(), list.size(), 1);
 }
+// copies a column-major (rows x cols) buffer, e.g. a row-major (cols x rows) numpy array
+Eigen::MatrixXd tensor(const double* data, std::size_t rows, std::size_t cols) {
+    return Eigen::Map<const Eigen::MatrixXd>(data, rows, cols);
+}
 
 Agents& operator<<(Agents& vector, Agent&& rover) {
     vector.push_back(std::move(rover));
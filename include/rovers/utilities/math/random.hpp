@@ -1,20 +1,84 @@
 #ifndef THYME_MATH_RANDOM
 #define THYME_MATH_RANDOM
 
+#include <algorithm>
+#include <array>
+#include <atomic>
 #include <cmath>
-#include <random>
+#include <cstdint>
+#include <limits>
 
 namespace thyme::math {
 
-std::mt19937 rand_gen;
-std::uniform_real_distribution<> rand_uniform_dist(0.0, 1.0);
-std::normal_distribution<> rand_normal_dist(0.0, 1.0);
+/*
+ *
+ * xoshiro256** generator seeded through splitmix64. Rng(seed, stream) are independent streams of
+ * one seed: give each environment or thread its own instead of sharing a generator.
+ * Satisfies UniformRandomBitGenerator, so it also drives the std distributions.
+ *
+ */
+class Rng {
+   public:
+    using result_type = std::uint64_t;
 
-inline double random() { return rand_uniform_dist(rand_gen); }
+    explicit Rng(std::uint64_t seed = 0, std::uint64_t stream = 0) { this->seed(seed, stream); }
 
-inline double random(const double lo, const double hi) {
-    return lo + (hi - lo) * rand_uniform_dist(rand_gen);
-}
+    void seed(std::uint64_t seed, std::uint64_t stream = 0) {
+        // streams of the same seed start from unrelated states
+        std::uint64_t x = seed ^ splitmix64(stream);
+        for (auto& word : m_state) word = splitmix64(x);
+    }
+    // a new generator seeded from this one
+    Rng split(std::uint64_t stream = 0) { return Rng((*this)(), stream); }
+
+    static constexpr result_type min() { return 0; }
+    static constexpr result_type max() { return std::numeric_limits<result_type>::max(); }
+    result_type operator()() {
+        const std::uint64_t result = rotl(m_state[1] * 5, 7) * 9;
+        const std::uint64_t t = m_state[1] << 17;
+        m_state[2] ^= m_state[0];
+        m_state[3] ^= m_state[1];
+        m_state[1] ^= m_state[2];
+        m_state[0] ^= m_state[3];
+        m_state[2] ^= t;
+        m_state[3] = rotl(m_state[3], 45);
+        return result;
+    }
+
+    // [0, 1)
+    double uniform() { return ((*this)() >> 11) * 0x1.0p-53; }
+    double uniform(double lo, double hi) { return lo + (hi - lo) * uniform(); }
+    // [0, hi_exclusive)
+    std::size_t integer(std::size_t hi_exclusive) {
+        return std::min<std::size_t>(uniform() * hi_exclusive, hi_exclusive - 1);
+    }
+    double normal(double mean = 0.0, double stddev = 1.0) {
+        // Box-Muller, u1 in (0, 1]
+        const double u1 = 1.0 - uniform(), u2 = uniform();
+        return mean + stddev * std::sqrt(-2.0 * std::log(u1)) * std::cos(2.0 * M_PI * u2);
+    }
+
+   private:
+    static std::uint64_t rotl(std::uint64_t x, int k) { return (x << k) | (x >> (64 - k)); }
+    static std::uint64_t splitmix64(std::uint64_t& x) {
+        std::uint64_t z = (x += 0x9e3779b97f4a7c15ULL);
+        z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL;
+        z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL;
+        return z ^ (z >> 31);
+    }
+
+   private:
+    std::array<std::uint64_t, 4> m_state;
+};
+
+// one generator per thread for the free functions below, each on its own stream of seed 0 in
+// the order threads first use it; reseed a thread's generator with rand_gen.seed()
+inline std::atomic<std::uint64_t> rand_streams{0};
+inline thread_local Rng rand_gen(0, rand_streams++);
+
+inline double random() { return rand_gen.uniform(); }
+
+inline double random(const double lo, const double hi) { return rand_gen.uniform(lo, hi); }
 
 inline double rand_bernoulli(const double input) {
     if (random() < input)
@@ -24,19 +88,19 @@ inline double rand_bernoulli(const double input) {
 }
 
 inline int rand_int(const int hi_exclusive) {
-    return (int)std::floor((double)hi_exclusive * rand_uniform_dist(rand_gen));
+    return (int)std::floor((double)hi_exclusive * rand_gen.uniform());
 }
 
 inline int rand_int(const int lo, const int hi_exclusive) {
-    return lo + (int)std::floor((double)(hi_exclusive - lo) * rand_uniform_dist(rand_gen));
+    return lo + (int)std::floor((double)(hi_exclusive - lo) * rand_gen.uniform());
 }
 
-inline double rand_normal() { return rand_normal_dist(rand_gen); }
+inline double rand_normal() { return rand_gen.normal(); }
 
 inline double rand_normal(const double mean, const double variance) {
-    return variance * rand_normal_dist(rand_gen) + mean;
+    return variance * rand_gen.normal() + mean;
 }
 
 }  // namespace thyme::math
 
-#endif
\ No newline at end of file
+#endif
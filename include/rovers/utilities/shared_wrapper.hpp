@@ -17,6 +17,8 @@ class SharedWrap {
     template <typename U>
     SharedWrap(U x) : self_(std::make_shared<U>(std::move(x))) {}
 
+    // empty, for containers that default construct their elements (the python dictionary's)
+    SharedWrap() = default;
     SharedWrap(const SharedWrap& x) = default;
     SharedWrap(SharedWrap&&) noexcept = default;
     ~SharedWrap() = default;
@@ -2,7 +2,8 @@
 #define THYME_SPACES_DISCRETE
 
 #include <Eigen/Dense>
-#include <random>
+#include <cstdint>
+#include <rovers/utilities/math/random.hpp>
 
 namespace thyme::spaces {
 
@@ -16,12 +17,17 @@ class Discrete {
     using value_shape = Eigen::MatrixXd;
     using value_type = size_t;
 
-    Discrete(std::size_t m = 1) : m_m(m) {
-        std::random_device rd;
-        m_gen = std::mt19937(rd());  // get global seed here
-        m_dis = std::uniform_int_distribution<int>(0, m_m - 1);
-    }
-    value_type sample() { return m_dis(m_gen); }
+    // a rover's action space is seeded from its environment's random stream (see
+    // Rover::action_space); a standalone one starts from seed 0 unless given a seed or a stream
+    // such as env.rng().split(i)
+    Discrete(std::size_t m = 1) : m_m(m) {}
+    Discrete(std::size_t m, std::uint64_t seed, std::uint64_t stream = 0)
+        : m_m(m), m_gen(seed, stream) {}
+    Discrete(std::size_t m, const thyme::math::Rng& rng) : m_m(m), m_gen(rng) {}
+
+    void seed(std::uint64_t seed, std::uint64_t stream = 0) { m_gen.seed(seed, stream); }
+    void seed(const thyme::math::Rng& rng) { m_gen = rng; }
+    value_type sample() { return m_gen.integer(m_m); }
     value_type max(const value_shape& values) {
         size_t max_index;
         values.col(0).maxCoeff(&max_index);
@@ -30,8 +36,7 @@ class Discrete {
 
    private:
     std::size_t m_m;
-    std::uniform_int_distribution<int> m_dis;
-    std::mt19937 m_gen;
+    thyme::math::Rng m_gen;
 };
 
 }  // namespace thyme::spaces
@@ -0,0 +1,35 @@
+#ifndef THYME_UTILITIES_SPAN
+#define THYME_UTILITIES_SPAN
+
+#include <cstddef>
+#include <vector>
+
+namespace thyme::utilities {
+
+/*
+ *
+ * Non-owning view of contiguous elements. Minimal stand-in for std::span (c++20).
+ *
+ */
+template <typename T>
+class Span {
+   public:
+    Span() = default;
+    Span(const T* data, std::size_t size) : m_data(data), m_size(size) {}
+    Span(const std::vector<T>& vector) : m_data(vector.data()), m_size(vector.size()) {}
+
+    const T* begin() const { return m_data; }
+    const T* end() const { return m_data + m_size; }
+    const T& operator[](std::size_t index) const { return m_data[index]; }
+    const T* data() const { return m_data; }
+    std::size_t size() const { return m_size; }
+    bool empty() const { return m_size == 0; }
+
+   private:
+    const T* m_data{nullptr};
+    std::size_t m_size{0};
+};
+
+}  // namespace thyme::utilities
+
+#endif
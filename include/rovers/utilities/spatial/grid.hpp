@@ -0,0 +1,104 @@
+#ifndef THYME_SPATIAL_GRID
+#define THYME_SPATIAL_GRID
+
+#include <algorithm>
+#include <cmath>
+#include <rovers/utilities/math/cartesian.hpp>
+#include <vector>
+
+namespace thyme::spatial {
+
+/*
+ *
+ * Uniform grid over a set of points for fixed-radius neighbour queries.
+ * Rebuilt with a counting sort; does not allocate once its buffers have grown.
+ * The indexed points must outlive the grid and be rebuilt after they move.
+ *
+ */
+class UniformGrid {
+    using Point = thyme::math::Point;
+
+   public:
+    void build(const std::vector<Point>& points, double cell_size) {
+        m_points = &points;
+        m_cols = m_rows = 0;
+        if (points.empty()) return;
+
+        m_min = m_max = points.front();
+        for (const auto& p : points) {
+            m_min.x = std::min(m_min.x, p.x), m_min.y = std::min(m_min.y, p.y);
+            m_max.x = std::max(m_max.x, p.x), m_max.y = std::max(m_max.y, p.y);
+        }
+        // bound the number of cells by the number of points
+        m_cell = std::max(cell_size, 1e-6);
+        const double max_cells = std::max<double>(64.0, 4.0 * points.size());
+        const double cells = cells_for(m_cell);
+        if (cells > max_cells) m_cell *= std::sqrt(cells / max_cells);
+        m_cols = std::floor((m_max.x - m_min.x) / m_cell) + 1;
+        m_rows = std::floor((m_max.y - m_min.y) / m_cell) + 1;
+
+        // counting sort of point indices by cell
+        m_start.assign(m_cols * m_rows + 1, 0);
+        m_cell_of.resize(points.size());
+        for (std::size_t i = 0; i < points.size(); ++i) {
+            m_cell_of[i] = cell(col(points[i].x), row(points[i].y));
+            ++m_start[m_cell_of[i] + 1];
+        }
+        for (std::size_t c = 1; c < m_start.size(); ++c) m_start[c] += m_start[c - 1];
+        m_items.resize(points.size());
+        m_fill.assign(m_start.begin(), m_start.end() - 1);
+        for (std::size_t i = 0; i < points.size(); ++i) m_items[m_fill[m_cell_of[i]]++] = i;
+    }
+
+    // calls visit(index) for every point within radius of center, and for the odd point a
+    // rounding error further: the squared distances compared here can round the other way than
+    // thyme::math::l2_norm, so callers test the exact distance they need
+    template <typename Visitor>
+    void query(const Point& center, double radius, Visitor&& visit) const {
+        if (m_cols == 0) return;
+        const double reach = radius * (1.0 + 1e-9), reach2 = reach * reach;
+        const std::size_t col_lo = col(center.x - reach), col_hi = col(center.x + reach);
+        const std::size_t row_lo = row(center.y - reach), row_hi = row(center.y + reach);
+
+        for (std::size_t r = row_lo; r <= row_hi; ++r) {
+            for (std::size_t c = col_lo; c <= col_hi; ++c) {
+                const std::size_t id = cell(c, r);
+                for (std::size_t k = m_start[id]; k < m_start[id + 1]; ++k) {
+                    const std::size_t i = m_items[k];
+                    const double x = (*m_points)[i].x - center.x;
+                    const double y = (*m_points)[i].y - center.y;
+                    if (x * x + y * y <= reach2) visit(i);
+                }
+            }
+        }
+    }
+
+   private:
+    double cells_for(double cell_size) const {
+        return (std::floor((m_max.x - m_min.x) / cell_size) + 1) *
+               (std::floor((m_max.y - m_min.y) / cell_size) + 1);
+    }
+    // clamped cell coordinates; queries outside the bounds land in the border cells
+    std::size_t col(double x) const {
+        return std::clamp<double>(std::floor((x - m_min.x) / m_cell), 0.0, m_cols - 1.0);
+    }
+    std::size_t row(double y) const {
+        return std::clamp<double>(std::floor((y - m_min.y) / m_cell), 0.0, m_rows - 1.0);
+    }
+    std::size_t cell(std::size_t c, std::size_t r) const { return r * m_cols + c; }
+
+   private:
+    const std::vector<Point>* m_points{nullptr};
+    Point m_min, m_max;
+    double m_cell{1.0};
+    std::size_t m_cols{0}, m_rows{0};
+
+    std::vector<std::size_t> m_start;
+    std::vector<std::size_t> m_items;
+    std::vector<std::size_t> m_cell_of;
+    std::vector<std::size_t> m_fill;
+};
+
+}  // namespace thyme::spatial
+
+#endif
@@ -0,0 +1,149 @@
+#ifndef THYME_ENVIRONMENTS_ROVERS_VEC_ENVIRONMENT
+#define THYME_ENVIRONMENTS_ROVERS_VEC_ENVIRONMENT
+
+#include <algorithm>
+#include <cstdint>
+#include <rovers/environment.hpp>
+#include <stdexcept>
+#include <tuple>
+#include <vector>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+namespace rovers {
+
+/*
+ *
+ * K independent environments stepped together across worker threads.
+ * Environments must not share rovers or pois (binding them to a second one throws).
+ *
+ */
+template <typename InitPolicy = RandomInit>
+class VecEnvironment {
+   public:
+    using Env = Environment<InitPolicy>;
+    using Action = typename Env::Action;
+    using State = std::vector<typename Env::State>;
+    using Reward = std::vector<typename Env::Reward>;
+    using Done = std::vector<bool>;
+
+    // max_steps = 0: keep each environment's own limit (by default, episodes only end when all
+    // pois are observed). An episode ends when its environment is done or truncated.
+    // num_threads = 0: use all available threads. Environments with python components (see
+    // native()) are stepped on the calling thread, which holds the GIL.
+    VecEnvironment(std::vector<Env> envs = {}, size_t max_steps = 0, int num_threads = 0)
+        : m_envs(std::move(envs)),
+          m_steps(m_envs.size(), 0),
+          m_done(m_envs.size(), 0),
+          m_num_threads(num_threads) {
+        if (max_steps > 0)
+            for (auto& env : m_envs) env.set_max_steps(max_steps);
+    }
+
+    size_t size() const { return m_envs.size(); }
+    Env& env(size_t index) { return m_envs[index]; }
+    const std::vector<size_t>& steps() const { return m_steps; }
+    // see Environment::native()
+    bool native() const {
+        return std::all_of(m_envs.begin(), m_envs.end(), [](const Env& env) { return env.native(); });
+    }
+
+    // environment i draws from stream i of the seed: one seed reproduces the whole run
+    void seed(std::uint64_t seed) {
+        for (size_t i = 0; i < m_envs.size(); ++i) m_envs[i].seed(seed, i);
+    }
+
+    // steps every environment. Finished environments are reset and report their initial state.
+    // Buffered environments return empty states (read their state buffers) but their rewards.
+    std::tuple<State, Reward, Done> step(const std::vector<std::vector<Action>>& actions) {
+        if (actions.size() != m_envs.size())
+            throw std::invalid_argument("VecEnvironment: expected one action list per environment");
+        return step_each([&](Env& env, size_t i) { return env.step(actions[i]); });
+    }
+    // actions of all rovers of all environments as one row-major (total_rovers x action_dim)
+    // buffer, environment by environment
+    std::tuple<State, Reward, Done> step(const double* actions, size_t action_dim) {
+        return step_rows(actions, action_dim);
+    }
+    std::tuple<State, Reward, Done> step(const float* actions, size_t action_dim) {
+        return step_rows(actions, action_dim);
+    }
+
+    std::tuple<State, Reward> reset() {
+        State states(m_envs.size());
+        Reward rewards(m_envs.size());
+        const long num_envs = m_envs.size();
+
+#ifdef _OPENMP
+#pragma omp parallel for schedule(dynamic) num_threads(threads())
+#endif
+        for (long i = 0; i < num_envs; ++i) {
+            std::tie(states[i], rewards[i]) = m_envs[i].reset();
+            m_steps[i] = 0;
+        }
+        return {states, rewards};
+    }
+
+   private:
+    // steps environment i with step(env, i), in parallel
+    template <typename Step>
+    std::tuple<State, Reward, Done> step_each(Step&& step) {
+        State states(m_envs.size());
+        Reward rewards(m_envs.size());
+        const long num_envs = m_envs.size();
+
+#ifdef _OPENMP
+#pragma omp parallel for schedule(dynamic) num_threads(threads())
+#endif
+        for (long i = 0; i < num_envs; ++i) {
+            auto& env = m_envs[i];
+            std::tie(states[i], rewards[i]) = step(env, i);
+            if (env.buffered()) {
+                // returned as well: an auto-reset below overwrites the reward buffer
+                const auto& buffer = env.reward_buffer();
+                rewards[i].assign(buffer.data(), buffer.data() + buffer.size());
+            }
+            m_steps[i] = env.info().steps;
+            m_done[i] = env.done() || env.truncated();
+            if (m_done[i]) {
+                // auto-reset: keep the final rewards, hand back the initial state
+                states[i] = std::get<0>(env.reset());
+                m_steps[i] = 0;
+            }
+        }
+        return {states, rewards, Done(m_done.begin(), m_done.end())};
+    }
+    template <typename Scalar>
+    std::tuple<State, Reward, Done> step_rows(const Scalar* actions, size_t action_dim) {
+        // first row of each environment
+        m_offsets.resize(m_envs.size());
+        size_t offset = 0;
+        for (size_t i = 0; i < m_envs.size(); ++i) {
+            m_offsets[i] = offset;
+            offset += m_envs[i].rovers().size();
+        }
+        return step_each([&](Env& env, size_t i) {
+            return env.step(actions + m_offsets[i] * action_dim, action_dim);
+        });
+    }
+
+#ifdef _OPENMP
+    int threads() const {
+        if (!native()) return 1;
+        return m_num_threads > 0 ? m_num_threads : omp_get_max_threads();
+    }
+#endif
+
+   private:
+    std::vector<Env> m_envs;
+    std::vector<size_t> m_steps;
+    std::vector<char> m_done;  // per-env writes from worker threads; not vector<bool>
+    std::vector<size_t> m_offsets;
+
+    int m_num_threads;
+};
+
+}  // namespace rovers
+
+#endif
@@ -31,6 +31,27 @@ class DepthCamera (rovers.ISensor):
         return rovers.tensor([composed_image, 1.0])
 
 
+"""
+NearestPOI: distance to the closest unobserved poi, vectorized over every rover using this sensor.
+scan_batch is called once per step with all of them; scan is the per-rover fallback.
+"""
+class NearestPOI (rovers.ISensor):
+    def scan(self, agent_pack):
+        position = agent_pack.agent.position()
+        distances = [np.hypot(poi.position().x - position.x, poi.position().y - position.y)
+                     for poi in agent_pack.entities if not poi.observed()]
+        return rovers.tensor([min(distances, default=-1.0)])
+
+    def scan_batch(self, world, agents):
+        arrays = world_arrays(world)
+        positions = arrays['agent_position'][list(agents)]
+        pois = arrays['poi_position'][~arrays['poi_observed']]
+        if len(pois) == 0:
+            return from_numpy(np.full((len(positions), 1), -1.0))
+        distances = np.linalg.norm(positions[:, None, :] - pois[None, :, :], axis=-1)
+        return from_numpy(distances.min(axis=1, keepdims=True))
+
+
 # aliasing some types to reduce typing
 Dense = rovers.Lidar[rovers.Density]        # lidar with density composition
 Close = rovers.Lidar[rovers.Closest]        # lidar for closest rover/poi
@@ -48,6 +69,9 @@ agents = [
     rovers.Rover[Camera, Discrete](2.0, Camera()),
     # Rover with our custom depth camera sensor and Lidar Density composition
     rovers.Rover[DepthCamera, Discrete](2.0, DepthCamera(rovers.Density)),
+    # Rovers sharing one batched scan per step
+    rovers.Rover[NearestPOI, Discrete](2.0, NearestPOI()),
+    rovers.Rover[NearestPOI, Discrete](2.0, NearestPOI()),
 ]
 
 # Three POIs with Count and Type constraints:
@@ -17,6 +17,40 @@ class InDifference (rovers.rewards.IReward):
         reward_without_me = rovers.rewards.Global().compute((agent_pack.agent, without_me, agent_pack.entities))
         return global_reward - reward_without_me
 
+"""
+Team reward computed for all rovers that use it with one vectorized call per step:
+the value of the pois observed this step, split between the rovers that observe them.
+A rover observes a poi within both its own and the poi's radius, as counted by the world.
+"""
+class SharedReward (rovers.rewards.IReward):
+    @staticmethod
+    def in_range(rover, poi):
+        dx, dy = poi.position().x - rover.position().x, poi.position().y - rover.position().y
+        distance = np.sqrt(dx * dx + dy * dy)
+        return distance <= rover.obs_radius() and distance <= poi.obs_radius()
+
+    def compute(self, agent_pack):
+        reward = 0.0
+        for poi in agent_pack.entities:
+            if poi.observed() or not self.in_range(agent_pack.agent, poi):
+                continue
+            if poi.constraint_satisfied((poi, agent_pack.agents, agent_pack.entities)):
+                in_range = sum(self.in_range(rover, poi) for rover in agent_pack.agents)
+                reward += poi.value() / in_range
+        return reward
+
+    def compute_batch(self, world, agents):
+        arrays = world_arrays(world)
+        observed = arrays['newly_observed']
+        agents = list(agents)
+        offsets = arrays['poi_position'][observed][None, :, :] - arrays['agent_position'][agents][:, None, :]
+        distances = np.sqrt(offsets[..., 0] * offsets[..., 0] + offsets[..., 1] * offsets[..., 1])
+        in_range = ((distances <= arrays['agent_radius'][agents][:, None]) &
+                    (distances <= arrays['poi_radius'][observed][None, :]))
+        # observers: rovers in range of each poi, as in_range above
+        shares = arrays['poi_value'][observed] / np.maximum(arrays['observers'][observed], 1)
+        return from_numpy(in_range @ shares)
+
 # Rewards can be arbitrarily complex:
 """
 Reward when POIs are observed in a certain order.
@@ -81,41 +115,45 @@ class FSMReward (rovers.rewards.IReward):
                 self.transition()
 
 
-# aliasing some types to reduce typing
-Dense = rovers.Lidar[rovers.Density]        # lidar with density composition
-Close = rovers.Lidar[rovers.Closest]        # lidar for closest rover/poi
-Discrete = thyme.spaces.Discrete            # Discrete action space
-Difference = rovers.rewards.Difference      # Difference reward
-
-agents = [
-    # create agent with difference reward
-    rovers.Rover[Dense, Discrete, Difference](1.0, Dense(90)),
-    # create rover with close lidar and global reward
-    rovers.Rover[Close, Discrete](2.0, Close(90)),
-    rovers.Drone(),  # drone with no policy specifications (all defaults)
-    # Rover with Close Lidar sensor that uses an InDifference reward
-    rovers.Rover[Close, Discrete, InDifference](2.0, Close(90), InDifference()),
-    # Rover with Dense Lidar sensor that uses an InDifference reward
-    rovers.Rover[Dense, Discrete, FSMReward](10.0, Dense(90), FSMReward())
-]
-
-# Three POIs with Count and Type constraints:
-pois = [
-    # 3 agents must observe
-    rovers.POI[rovers.CountConstraint](3),
-    # 2 agents of a certaiin type to get value 1.0
-    rovers.POI[rovers.TypeConstraint](2, 1.0),
-    # 5 agents of a certain type must observe
-    rovers.POI[rovers.TypeConstraint](5)
-]
-
-# Environment with rovers and pois placed in the corners. Defaults to random initialization if unspecified.
-Env = rovers.Environment[rovers.CornersInit]
-# create an environment with our rovers and pois:
-env = Env(rovers.CornersInit(10.0), agents, pois)
-states, rewards = env.reset()
-
-# print sample state
-print("Sample environment state (each row corresponds to the state of a rover): ")
-for state in states:
-    print(state.transpose())
+if __name__ == '__main__':
+    # aliasing some types to reduce typing
+    Dense = rovers.Lidar[rovers.Density]        # lidar with density composition
+    Close = rovers.Lidar[rovers.Closest]        # lidar for closest rover/poi
+    Discrete = thyme.spaces.Discrete            # Discrete action space
+    Difference = rovers.rewards.Difference      # Difference reward
+
+    agents = [
+        # create agent with difference reward
+        rovers.Rover[Dense, Discrete, Difference](1.0, Dense(90)),
+        # create rover with close lidar and global reward
+        rovers.Rover[Close, Discrete](2.0, Close(90)),
+        rovers.Drone(),  # drone with no policy specifications (all defaults)
+        # Rover with Close Lidar sensor that uses an InDifference reward
+        rovers.Rover[Close, Discrete, InDifference](2.0, Close(90), InDifference()),
+        # Rover with Dense Lidar sensor that uses an InDifference reward
+        rovers.Rover[Dense, Discrete, FSMReward](10.0, Dense(90), FSMReward()),
+        # Rovers with a batched reward: one compute_batch call per step for both
+        rovers.Rover[Dense, Discrete, SharedReward](1.0, Dense(90), SharedReward()),
+        rovers.Rover[Close, Discrete, SharedReward](3.0, Close(90), SharedReward())
+    ]
+
+    # Three POIs with Count and Type constraints:
+    pois = [
+        # 3 agents must observe
+        rovers.POI[rovers.CountConstraint](3),
+        # 2 agents of a certaiin type to get value 1.0
+        rovers.POI[rovers.TypeConstraint](2, 1.0),
+        # 5 agents of a certain type must observe
+        rovers.POI[rovers.TypeConstraint](5)
+    ]
+
+    # Environment with rovers and pois placed in the corners. Defaults to random initialization if unspecified.
+    Env = rovers.Environment[rovers.CornersInit]
+    # create an environment with our rovers and pois:
+    env = Env(rovers.CornersInit(10.0), agents, pois)
+    states, rewards = env.reset()
+
+    # print sample state
+    print("Sample environment state (each row corresponds to the state of a rover): ")
+    for state in states:
+        print(state.transpose())
@@ -143,11 +143,12 @@ after all other POIs have been observed.
 """
 class LastPOIConstraint(rovers.IConstraint):
     def is_satisfied(self, entity_pack):
-        for poi in entity_pack.entities:
-            if not poi.observed():
-                return False
-
-        return True
+        # only this poi is left unobserved
+        if entity_pack.world:
+            # the environment's index of unobserved pois
+            return entity_pack.world.active_entities.size() <= 1
+        unobserved = sum(1 for poi in entity_pack.entities if not poi.observed())
+        return unobserved <= 1
 
 
 
@@ -0,0 +1,38 @@
+from librovers import *  # import bindings.
+import numpy as np
+
+"""
+Stepping many independent environments in one call.
+The environments are stepped across OpenMP worker threads with the precompiled library (`make library`);
+the JIT'd headers step them one after the other. Environments with python components (sensors, rewards,
+pois, ...) always step on the calling thread, see env.native().
+"""
+
+# aliasing some types to reduce typing
+Dense = rovers.Lidar[rovers.Density]        # lidar with density composition
+Close = rovers.Lidar[rovers.Closest]        # lidar for closest rover/poi
+Discrete = thyme.spaces.Discrete            # Discrete action space
+
+Env = rovers.Environment[rovers.CornersInit]
+
+
+# every environment needs its own rovers and pois
+def make_env():
+    agents = [rovers.Rover[Dense, Discrete](3.0, Dense(90)) for _ in range(4)]
+    pois = [rovers.POI[rovers.CountConstraint](1.0, 2.0, rovers.CountConstraint(2)) for _ in range(4)]
+    return Env(rovers.CornersInit(10.0), agents, pois)
+
+
+num_envs = 16
+# episodes end after 100 steps or when all pois are observed. Finished environments are reset.
+VecEnv = rovers.VecEnvironment[rovers.CornersInit]
+envs = VecEnv([make_env() for _ in range(num_envs)], 100)
+envs.seed(42)   # environment i draws from stream i of seed 42: reruns reproduce the same episodes
+states, rewards = envs.reset()
+
+for _ in range(1000):
+    # actions of all rovers of all environments in one (num_envs * 4 x 2) array
+    actions = np.random.uniform(-1.0, 1.0, (num_envs * 4, 2))
+    states, rewards, dones = step_array(envs, actions)
+
+print("Episode steps per environment: ", list(envs.steps()))
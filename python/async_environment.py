@@ -0,0 +1,190 @@
+import multiprocessing as mp
+import numpy as np
+import traceback
+from multiprocessing import resource_tracker, shared_memory
+
+"""
+VecEnvironment semantics with one worker process per environment, for scenarios whose python
+components (sensors, rewards, pois, ...) hold the GIL: environments then step on separate cores.
+Actions, states, rewards and dones move through shared memory; the pipes only carry commands.
+
+Workers build their environment with a picklable (top-level) function, and every environment must
+have the same number of rovers and state size:
+    def make_env():
+        return Env(rovers.CornersInit(10.0), agents, pois)
+
+    if __name__ == '__main__':
+        envs = AsyncVecEnvironment([make_env] * 8, max_steps=100)
+        states, rewards = envs.reset()
+        envs.step_async(actions)   # (num_envs * num_rovers x action_dim) or (num_envs x num_rovers x action_dim)
+        ...                        # overlaps with the workers
+        states, rewards, dones = envs.step_wait()
+        envs.close()
+"""
+
+
+def _attach(name, shape, dtype):
+    memory = shared_memory.SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _worker(index, make_env, max_steps, seed, pipe):
+    from librovers import buffers, step_array
+    memories = []
+    try:
+        env = make_env()
+        env.set_buffered(True)
+        if max_steps > 0:
+            env.set_max_steps(max_steps)
+        if seed is not None:
+            env.seed(seed, index)
+        env.reset()
+        states, rewards = buffers(env)
+        pipe.send(('ready', states.shape))
+
+        # the parent allocates the shared arrays once it knows the shapes
+        command, layout = pipe.recv()
+        views = {}
+        for key, (name, shape, dtype) in layout.items():
+            memory, array = _attach(name, shape, dtype)
+            memories.append(memory)
+            # one-element slice of the (num_envs,) dones: array[index] would be a scalar copy
+            views[key] = array[index] if array.ndim > 1 else array[index:index + 1]
+
+        while True:
+            command = pipe.recv()
+            if command == 'reset':
+                env.reset()
+                views['dones'][...] = False
+            elif command == 'step':
+                step_array(env, views['actions'])
+                done = env.done() or env.truncated()
+                views['dones'][...] = done
+                if done:
+                    # auto-reset: keep the final rewards, hand back the initial state
+                    views['rewards'][...] = rewards
+                    env.reset()
+                    views['states'][...] = states
+                    pipe.send('ok')
+                    continue
+            elif command == 'close':
+                break
+            views['states'][...] = states
+            views['rewards'][...] = rewards
+            pipe.send('ok')
+    except Exception:
+        pipe.send(('error', traceback.format_exc()))
+    finally:
+        for memory in memories:
+            memory.close()
+        pipe.close()
+
+
+class AsyncVecEnvironment:
+
+    def __init__(self, env_fns, max_steps=0, action_dim=2, seed=None, context='spawn'):
+        """One worker per function in `env_fns`. max_steps = 0: keep each environment's own limit
+        (see VecEnvironment). Environment i is seeded with stream i of `seed` when given."""
+        self.num_envs = len(env_fns)
+        self.action_dim = action_dim
+        self._memories, self._pipes, self._processes = [], [], []
+        self._waiting = False
+        self._closed = False
+
+        # workers must share the parent's resource tracker: a forked worker would otherwise start
+        # its own, which unlinks the shared blocks it attached to when the worker exits
+        resource_tracker.ensure_running()
+        ctx = mp.get_context(context)
+        for index, make_env in enumerate(env_fns):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(index, make_env, max_steps, seed, child),
+                                  daemon=True)
+            process.start()
+            child.close()
+            self._pipes.append(parent)
+            self._processes.append(process)
+
+        shapes = {self._receive(pipe)[1] for pipe in self._pipes}
+        if len(shapes) != 1:
+            self.close()
+            raise ValueError(f'environments differ in (num_rovers, state_size): {sorted(shapes)}')
+        self.num_rovers, self.state_size = shapes.pop()
+
+        layout = {}
+        for key, shape, dtype in [
+                ('actions', (self.num_envs, self.num_rovers, action_dim), np.float64),
+                ('states', (self.num_envs, self.num_rovers, self.state_size), np.float64),
+                ('rewards', (self.num_envs, self.num_rovers), np.float64),
+                ('dones', (self.num_envs,), np.bool_)]:
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            memory = shared_memory.SharedMemory(create=True, size=size)
+            self._memories.append(memory)
+            setattr(self, '_' + key, np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+            layout[key] = (memory.name, shape, dtype)
+        for pipe in self._pipes:
+            pipe.send(('layout', layout))
+
+    def reset(self):
+        """(num_envs x num_rovers x state_size) states and (num_envs x num_rovers) rewards.
+        The arrays are shared with the workers and refreshed in place by the next call."""
+        self._send_all('reset')
+        self._wait_all()
+        return self._states, self._rewards
+
+    def step_async(self, actions):
+        """Starts stepping every environment; actions are copied before returning."""
+        if self._waiting:
+            raise RuntimeError('step_async called again before step_wait')
+        self._actions[...] = np.reshape(actions, self._actions.shape)
+        self._send_all('step')
+        self._waiting = True
+
+    def step_wait(self):
+        """States, rewards and dones of the step started by step_async. Finished environments
+        are reset and report their initial state."""
+        if not self._waiting:
+            raise RuntimeError('step_wait called without step_async')
+        self._wait_all()
+        self._waiting = False
+        return self._states, self._rewards, self._dones
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for pipe, process in zip(self._pipes, self._processes):
+            if process.is_alive():
+                try:
+                    pipe.send('close')
+                except (BrokenPipeError, OSError):
+                    pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for memory in self._memories:
+            memory.close()
+            memory.unlink()
+        self._memories = []
+
+    def __del__(self):
+        self.close()
+
+    def _send_all(self, command):
+        for pipe in self._pipes:
+            pipe.send(command)
+
+    def _wait_all(self):
+        for pipe in self._pipes:
+            self._receive(pipe)
+
+    def _receive(self, pipe):
+        message = pipe.recv()
+        if isinstance(message, tuple) and message[0] == 'error':
+            self.close()
+            raise RuntimeError(f'environment worker failed:\n{message[1]}')
+        return message
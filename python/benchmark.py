@@ -0,0 +1,148 @@
+from librovers import *  # import bindings.
+import argparse
+import json
+import time
+
+"""
+Step throughput and latency through the python bindings, with C++ and python components.
+Prints JSON in the same format as the C++ benchmark (test/benchmark.cpp), keeping the fastest of
+several interleaved rounds per configuration:
+    make benchmark-python                   # against this machine's baseline, see the makefile
+    python3 python/benchmark.py --steps 500 > benchmark_python.json
+"""
+
+# aliasing some types to reduce typing
+Dense = rovers.Lidar[rovers.Density]
+Discrete = thyme.spaces.Discrete
+Difference = rovers.rewards.Difference
+Env = rovers.Environment[rovers.RandomInit]
+
+
+# python counterparts of the default lidar (Lidar<Density>), global and difference rewards
+class PyLidar(rovers.ISensor):
+    def __init__(self, resolution):
+        super().__init__()
+        self.resolution = resolution
+        self.sectors = int(360 / resolution)
+
+    # mean of value / distance^2 in each sector within range: rovers, then unobserved pois
+    def scan(self, agent_pack):
+        agent = agent_pack.agent
+        position, radius = agent.position(), agent.obs_radius()
+        sums, counts = np.zeros(2 * self.sectors), np.zeros(2 * self.sectors)
+
+        def sense(offset, other, value):
+            dx, dy = other.x - position.x, other.y - position.y
+            distance = np.hypot(dx, dy)
+            if distance <= radius:
+                angle = np.degrees(np.arctan2(dx, dy)) % 360.0
+                sector = offset + min(int(angle / self.resolution), self.sectors - 1)
+                sums[sector] += value / max(0.001, distance ** 2)
+                counts[sector] += 1
+
+        for rover in agent_pack.agents:
+            if std.addressof(rover) != std.addressof(agent):
+                sense(0, rover.position(), 1.0)
+        for poi in agent_pack.entities:
+            if not poi.observed():
+                sense(self.sectors, poi.position(), poi.value())
+        readings = np.divide(sums, counts, out=np.full_like(sums, -1.0), where=counts > 0)
+        return rovers.tensor(readings.tolist())
+
+
+class PyGlobal(rovers.rewards.IReward):
+    def compute(self, agent_pack):
+        return rovers.rewards.Global().compute(agent_pack)
+
+
+class PyDifference(rovers.rewards.IReward):
+    def compute(self, agent_pack):
+        without_me = [rover for rover in agent_pack.agents
+                      if std.addressof(rover) != std.addressof(agent_pack.agent)]
+        return (rovers.rewards.Global().compute(agent_pack) -
+                rovers.rewards.Global().compute((agent_pack.agent, without_me, agent_pack.entities)))
+
+
+def make_env(config, seed):
+    radius, resolution = 5.0, config['resolution']
+    difference = config['reward'] == 'difference'
+    if config['components'] == 'python':
+        Reward = PyDifference if difference else PyGlobal
+        agents = [rovers.Rover[PyLidar, Discrete, Reward](radius, PyLidar(resolution), Reward())
+                  for _ in range(config['agents'])]
+    elif difference:
+        agents = [rovers.Rover[Dense, Discrete, Difference](radius, Dense(resolution))
+                  for _ in range(config['agents'])]
+    else:
+        agents = [rovers.Rover[Dense, Discrete](radius, Dense(resolution))
+                  for _ in range(config['agents'])]
+    pois = [rovers.POI[rovers.CountConstraint](1.0, 2.0, rovers.CountConstraint(2))
+            for _ in range(config['pois'])]
+    # seeded uniform placement, as in the C++ suite
+    size = int(config['size'])
+    env = Env(rovers.RandomInit(config['size'], config['size']), agents, pois, size, size)
+    env.seed(seed)
+    return env
+
+
+def run(config, steps, seed=7, episode=100, warmup=20):
+    env = make_env(config, seed)
+    rng = np.random.default_rng(seed)
+    actions = rng.uniform(-1.0, 1.0, (steps + warmup, config['agents'], 2))
+
+    env.reset()
+    for s in range(warmup):
+        step_array(env, actions[s])
+    latencies = np.empty(steps)
+    for s in range(steps):
+        if (s + warmup) % episode == 0:
+            env.reset()
+        start = time.perf_counter()
+        step_array(env, actions[warmup + s])
+        latencies[s] = (time.perf_counter() - start) * 1e6
+
+    return dict(config, steps=steps,
+                steps_per_sec=1e6 * steps / latencies.sum(),
+                latency_us={
+                    'mean': latencies.mean(),
+                    'p50': np.percentile(latencies, 50),
+                    'p90': np.percentile(latencies, 90),
+                    'p99': np.percentile(latencies, 99),
+                })
+
+
+# one parameter varied at a time around the default configuration: the configurations of the C++
+# suite (test/benchmark.cpp) with C++ components, then with python components up to 64 rovers/pois
+# and a 10 degree resolution, as the larger ones take minutes per configuration.
+def sweeps():
+    default = dict(agents=16, pois=16, resolution=90.0, size=50.0, reward='global')
+    for components in ['cpp', 'python']:
+        base = dict(default, components=components)
+        cpp = components == 'cpp'
+        for agents in [4, 16, 64] + ([256] if cpp else []):
+            yield dict(base, sweep='agents', agents=agents)
+        for pois in [4, 64] + ([256] if cpp else []):
+            yield dict(base, sweep='pois', pois=pois)
+        for resolution in [45.0, 10.0] + ([1.0] if cpp else []):
+            yield dict(base, sweep='resolution', resolution=resolution)
+        for size in [10.0, 200.0]:
+            yield dict(base, sweep='size', size=size)
+        if cpp:
+            yield dict(base, sweep='scale', agents=1000, pois=10000, size=1000.0)
+        yield dict(base, sweep='reward', reward='difference')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the environment through the python bindings.')
+    parser.add_argument('--steps', type=int, default=500, help='timed steps per configuration and round')
+    parser.add_argument('--rounds', type=int, default=3, help='rounds per configuration, the fastest is kept')
+    args = parser.parse_args()
+
+    configs = list(sweeps())
+    results = [run(config, args.steps) for config in configs]
+    for _ in range(args.rounds - 1):
+        for i, config in enumerate(configs):
+            result = run(config, args.steps)
+            if result['steps_per_sec'] > results[i]['steps_per_sec']:
+                results[i] = result
+    print(json.dumps({'suite': 'python', 'results': results}, indent=2, default=float))
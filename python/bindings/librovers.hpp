@@ -0,0 +1,41 @@
+#ifndef THYME_ENVIRONMENTS_ROVERS_LIBROVERS
+#define THYME_ENVIRONMENTS_ROVERS_LIBROVERS
+
+/*
+ *
+ * Everything the python bindings load, compiled once into build/lib/librovers.so by `make library`.
+ * The explicit instantiations below are the combinations the examples use; other template
+ * arguments are still instantiated by cppyy on first use.
+ *
+ */
+// same order as python/librovers.py
+#include <rovers/environment.hpp>
+#include <rovers/vec_environment.hpp>
+#include <rovers/core/rewards/ireward.hpp>
+#include <rovers/core/rewards/difference.hpp>
+#include <rovers/core/setup/init_corners.hpp>
+#include <rovers/core/poi/iconstraint.hpp>
+#include <rovers/core/sensors/isensor.hpp>
+#include <rovers/utilities/spaces/discrete.hpp>
+
+namespace rovers {
+
+template class Lidar<Density>;
+template class Lidar<Closest>;
+
+template class Rover<Lidar<Density>, thyme::spaces::Discrete, rewards::Global>;
+template class Rover<Lidar<Density>, thyme::spaces::Discrete, rewards::Difference>;
+template class Rover<Lidar<Closest>, thyme::spaces::Discrete, rewards::Global>;
+template class Rover<Lidar<Closest>, thyme::spaces::Discrete, rewards::Difference>;
+
+template class POI<CountConstraint>;
+template class POI<TypeConstraint>;
+
+template class Environment<RandomInit>;
+template class Environment<CornersInit>;
+template class VecEnvironment<RandomInit>;
+template class VecEnvironment<CornersInit>;
+
+}  // namespace rovers
+
+#endif
@@ -0,0 +1,48 @@
+import argparse
+import json
+import sys
+
+"""
+Compares two benchmark runs (test/benchmark.cpp or python/benchmark.py output) configuration by
+configuration and exits with 1 when steps/sec drop by more than the tolerance. Both runs should
+come from the same machine, `make benchmark` keeps its baseline in build/:
+    python3 python/compare_benchmarks.py build/benchmark_baseline.json benchmark.json
+"""
+
+KEY = ('sweep', 'components', 'reward', 'agents', 'pois', 'resolution', 'size')
+
+
+def load(path):
+    with open(path) as f:
+        return {tuple(r[k] for k in KEY): r for r in json.load(f)['results']}
+
+
+def compare(baseline, current, tolerance):
+    regressions = 0
+    print(f"{'configuration':<84} {'baseline':>10} {'current':>10} {'change':>8}")
+    for key, result in current.items():
+        name = ' '.join(f'{k}={v}' for k, v in zip(KEY, key))
+        if key not in baseline:
+            print(f"{name:<84} {'-':>10} {result['steps_per_sec']:>10.0f}")
+            continue
+        before, after = baseline[key]['steps_per_sec'], result['steps_per_sec']
+        change = after / before - 1.0
+        flag = ''
+        if change < -tolerance:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f'{name:<84} {before:>10.0f} {after:>10.0f} {change:>+8.1%}{flag}')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare two benchmark runs (steps/sec).')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='allowed relative drop in steps/sec (default 0.1)')
+    args = parser.parse_args()
+
+    regressions = compare(load(args.baseline), load(args.current), args.tolerance)
+    print(f'{regressions} regression(s)')
+    sys.exit(1 if regressions else 0)
@@ -1,7 +1,7 @@
 """
 TODO: Gaurav
 Auto generated with bash.
-Create a shared library with make and link to it for production.
+Loads the precompiled library from `make library` when it exists, otherwise JITs the headers.
 """
 
 # hacked bindings
@@ -9,6 +9,8 @@ Create a shared library with make and link to it for production.
 # JIT
 
 import cppyy
+import cppyy.ll
+import numpy as np
 import os
 
 try:
@@ -23,13 +25,101 @@ libs_dir = os.path.join(source_dir, 'libs')
 cppyy.add_include_path(include_dir)
 cppyy.add_include_path(libs_dir)
 
-# Headers used in the python examples. A makefile will replace this.
-cppyy.include(os.path.join(include_dir, 'rovers/environment.hpp'))
-cppyy.include(os.path.join(include_dir, 'rovers/core/rewards/ireward.hpp'))
-cppyy.include(os.path.join(include_dir, 'rovers/core/rewards/difference.hpp'))
-cppyy.include(os.path.join(include_dir, 'rovers/core/setup/init_corners.hpp'))
-cppyy.include(os.path.join(include_dir, 'rovers/core/poi/iconstraint.hpp'))
-cppyy.include(os.path.join(include_dir, 'rovers/core/sensors/isensor.hpp'))
+# Precompiled dictionary and instantiations (`make library`): no header parsing at import.
+# The library is built with -fopenmp; cling does not support OpenMP, so with the JIT'd headers
+# VecEnvironment steps its environments one after the other.
+# Set ROVERS_JIT=1 to parse the headers instead, e.g. while editing them.
+# Set ROVERS_PROFILE=1 to JIT the headers with the step profiler compiled in.
+if os.environ.get('ROVERS_PROFILE'):
+    cppyy.cppdef('#define ROVERS_PROFILE 1')
+library = os.path.join(source_dir, 'build', 'lib', 'librovers.so')
+if os.path.exists(library) and not (os.environ.get('ROVERS_JIT') or os.environ.get('ROVERS_PROFILE')):
+    cppyy.load_reflection_info(library)
+else:
+    # Headers used in the python examples, see python/bindings/librovers.hpp.
+    cppyy.include(os.path.join(include_dir, 'rovers/environment.hpp'))
+    cppyy.include(os.path.join(include_dir, 'rovers/vec_environment.hpp'))
+    cppyy.include(os.path.join(include_dir, 'rovers/core/rewards/ireward.hpp'))
+    cppyy.include(os.path.join(include_dir, 'rovers/core/rewards/difference.hpp'))
+    cppyy.include(os.path.join(include_dir, 'rovers/core/setup/init_corners.hpp'))
+    cppyy.include(os.path.join(include_dir, 'rovers/core/poi/iconstraint.hpp'))
+    cppyy.include(os.path.join(include_dir, 'rovers/core/sensors/isensor.hpp'))
+
+
+def native(obj):
+    """Whether calling into obj never calls back into python: False for python classes derived
+    from the bindings and for C++ templates instantiated on one. Plain values are converted."""
+    klass = type(obj)
+    name = getattr(klass, '__cpp_name__', None)
+    if name is None:
+        return True
+    return klass.__module__.startswith('cppyy') and '__cppyy_internal' not in name
+
+
+def _native_arguments(args):
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            if not _native_arguments(arg):
+                return False
+        elif not native(arg):
+            return False
+    return True
+
+
+def _released(method, *signatures):
+    """A copy of one overload of `method` that drops the GIL while it runs, None if missing."""
+    for signature in signatures:
+        try:
+            overload = method.__overload__(signature)
+        except (LookupError, TypeError):
+            continue
+        overload.__release_gil__ = True
+        return overload
+    return None
+
+
+def _pythonize_environments(klass, name):
+    """Environment/VecEnvironment release the GIL in step()/reset() when env.native(): the
+    rovers, pois and init policy given to the constructor (or set_rovers/set_pois) are all C++
+    library types. Once a python component was seen the environment stays held. Components
+    handed to a rover through an interface type are not visible here; call env.set_native(False)
+    for those."""
+    if name.startswith('Environment<'):
+        for method in ['__init__', 'set_rovers', 'set_pois']:
+            def detect(self, *args, _held=getattr(klass, method), _method=method):
+                result = _held(self, *args)
+                native_now = _native_arguments(args) and native(self)
+                if _method == '__init__':
+                    self.set_native(native_now)
+                else:
+                    self.set_native(self.native() and native_now)
+                return result
+            setattr(klass, method, detect)
+    elif not name.startswith('VecEnvironment<'):
+        return
+
+    held_step, held_reset = klass.step, klass.reset
+    released_step = {
+        np.dtype(np.float64): _released(held_step, 'const double*, size_t', 'const double*, std::size_t'),
+        np.dtype(np.float32): _released(held_step, 'const float*, size_t', 'const float*, std::size_t')}
+    released_reset = _released(held_reset, '')
+
+    def step(self, *args):
+        if len(args) == 2 and isinstance(args[0], np.ndarray) and self.native():
+            method = released_step.get(args[0].dtype)
+            if method is not None:
+                return method(self, *args)
+        return held_step(self, *args)
+
+    def reset(self):
+        if released_reset is not None and self.native():
+            return released_reset(self)
+        return held_reset(self)
+
+    klass.step, klass.reset = step, reset
+
+
+cppyy.py.add_pythonization(_pythonize_environments, 'rovers')
 
 # making c++ namespaces visible
 rovers = cppyy.gbl.rovers
@@ -38,3 +128,109 @@ std = cppyy.gbl.std
 eigen = cppyy.gbl.Eigen
 
 # cppyy.set_debug()
+
+# storage of a vector as an integer: data() is converted by element type (a struct proxy for
+# points, a str for chars), which cannot be viewed in place
+cppyy.cppdef('''
+#include <cstdint>
+#include <vector>
+namespace rovers_python {
+template <typename T>
+std::uintptr_t address(const std::vector<T>& vector) { return reinterpret_cast<std::uintptr_t>(vector.data()); }
+}''')
+
+
+def as_numpy(matrix, shape, dtype=np.float64):
+    """Zero-copy NumPy view of an Eigen matrix/vector's (column-major) or std::vector's storage."""
+    data = matrix.data()
+    data.reshape((matrix.size(),))
+    return np.frombuffer(data, dtype=dtype, count=matrix.size()).reshape(shape)
+
+
+def vector_view(vector, shape, dtype, ctype):
+    """Zero-copy NumPy view of a std::vector whose storage is `ctype`s."""
+    count = int(np.prod(shape))
+    if count == 0:
+        return np.zeros(shape, dtype=dtype)
+    data = cppyy.ll.cast[ctype + '*'](cppyy.gbl.rovers_python.address(vector))
+    data.reshape((count,))
+    return np.frombuffer(data, dtype=dtype, count=count).reshape(shape)
+
+
+def world_arrays(world):
+    """NumPy views of a world's state for scan_batch/compute_batch: rover positions (N x 2) and
+    radii, poi positions (M x 2), radii, values, observed flags and observer counts (M,), the
+    indices of the pois not observed yet ('active') and of those observed this step
+    ('newly_observed'), rover types (N,) and observer counts by type (M x num_types)."""
+    agents, entities = world.agents, world.entities
+    n, m = agents.size(), entities.size()
+    types = world.num_types
+    return {
+        'agent_position': vector_view(agents.position, (n, 2), np.float64, 'double'),
+        'agent_radius': vector_view(agents.obs_radius, (n,), np.float64, 'double'),
+        'poi_position': vector_view(entities.position, (m, 2), np.float64, 'double'),
+        'poi_radius': vector_view(entities.obs_radius, (m,), np.float64, 'double'),
+        'poi_value': vector_view(entities.value, (m,), np.float64, 'double'),
+        'poi_observed': vector_view(entities.observed, (m,), np.bool_, 'bool'),
+        'observers': vector_view(world.observers, (world.observers.size(),), np.uint64, 'size_t'),
+        'active': vector_view(world.active_entities, (world.active_entities.size(),), np.uint64, 'size_t'),
+        'newly_observed': vector_view(world.newly_observed, (world.newly_observed.size(),), np.uint64, 'size_t'),
+        'agent_type': vector_view(agents.type, (n,), np.uint32, 'uint32_t'),
+        'type_observers': vector_view(world.type_observers, (world.type_observers.size() // types, types), np.uint64, 'size_t'),
+    }
+
+
+def from_numpy(array):
+    """Eigen matrix for scan_batch/compute_batch results: (num_agents x state_size) states become
+    one column per agent, (num_agents,) rewards a column vector."""
+    array = np.ascontiguousarray(array, dtype=np.float64)
+    if array.ndim == 1:
+        return rovers.tensor(array, array.shape[0], 1)
+    return rovers.tensor(array, array.shape[1], array.shape[0])
+
+
+def step_array(env, actions):
+    """Steps an Environment with one (num_rovers x action_dim) array, or a VecEnvironment with
+    one (total_rovers x action_dim) array, in a single call. float32 arrays are read as is."""
+    actions = np.asarray(actions)
+    if hasattr(env, 'env'):
+        num_rovers = sum(env.env(i).rovers().size() for i in range(env.size()))
+    else:
+        num_rovers = env.rovers().size()
+    if actions.ndim != 2 or actions.shape[0] != num_rovers:
+        # the environment reads num_rovers rows through a raw pointer
+        raise ValueError(f'expected ({num_rovers} x action_dim) actions, got {actions.shape}')
+    if actions.dtype != np.float32:
+        actions = actions.astype(np.float64, copy=False)
+    actions = np.ascontiguousarray(actions)
+    return env.step(actions, actions.shape[-1])
+
+
+def profile(env):
+    """Readings of env.profiler(): {phase: (seconds, calls)} totals plus (num_rovers x phases) and
+    (num_pois x phases) 'rover_seconds', 'rover_calls', 'poi_seconds' and 'poi_calls' arrays.
+    All zero unless imported with ROVERS_PROFILE=1. Clear with env.profiler().reset()."""
+    profiler = env.profiler()
+    phases = rovers.Profiler.num_phases
+    result = {rovers.Profiler.name(k): (profiler.seconds()[k], profiler.calls()[k])
+              for k in range(phases)}
+    for key in ['rover_seconds', 'rover_calls', 'poi_seconds', 'poi_calls']:
+        values = np.array(list(getattr(profiler, key)()))
+        result[key] = values.reshape((-1, phases))
+    return result
+
+
+def buffers(env):
+    """(num_rovers x state_size) states and (num_rovers,) rewards of a buffered environment.
+    The views are refreshed in place by env.step()/env.reset(); take them again if rovers change."""
+    states, rewards = env.state_buffer(), env.reward_buffer()
+    return as_numpy(states, (states.cols(), states.rows())), as_numpy(rewards, (rewards.size(),))
+
+
+def trajectory(env):
+    """(steps x num_rovers x 2) float32 copy of the rover positions kept by env's path history."""
+    history = env.trajectory()
+    packed = history.packed()
+    if packed.size() == 0:
+        return np.zeros((0, history.agents(), 2), dtype=np.float32)
+    return as_numpy(packed, (history.size(), history.agents(), 2), np.float32).copy()
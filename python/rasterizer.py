@@ -0,0 +1,122 @@
+import numpy as np
+
+"""
+Headless counterpart of RoversViewer (render_rovers.py): draws rovers, pois and the grid straight
+into (H x W x 3) uint8 numpy frames, no window or display needed. Same colors and layout as the
+viewer: y points up, one unit of padding around the world.
+    raster = Rasterizer(env.width(), env.height())
+    frame = raster.render(env)
+    frames = raster.render_batch(trajectory(env), poi_positions)  # e.g. for a video
+"""
+
+BLACK = np.array([0.0, 0.0, 0.0], dtype=np.float32)
+ROVER = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+POI = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+
+
+class Rasterizer:
+
+    def __init__(self, width, height, scale=10, padding=1.0, rover_size=0.5, poi_size=0.5):
+        """A (width x height) world drawn at `scale` pixels per unit."""
+        self.width, self.height = width, height
+        self.scale, self.padding = scale, padding
+        self.rover_size, self.poi_size = rover_size, poi_size
+        self.shape = (int(round((height + 2 * padding) * scale)),
+                      int(round((width + 2 * padding) * scale)), 3)
+        self._stamps = {}
+        self.background = self._grid()
+
+    def render(self, env):
+        """Frame of an environment's current state."""
+        from librovers import world_arrays
+        arrays = world_arrays(env.world())
+        return self.render_arrays(arrays['agent_position'], arrays['agent_radius'],
+                                  arrays['poi_position'], arrays['poi_radius'],
+                                  arrays['poi_observed'])
+
+    def render_arrays(self, rover_positions, rover_radii, poi_positions, poi_radii,
+                      poi_observed=None, out=None):
+        """Frame of (N x 2) rover and (M x 2) poi positions, with scalar or per-item radii and
+        optional (M,) observed flags. Writes into `out` when given."""
+        image = self.background.copy()
+        rover_positions, poi_positions = np.asarray(rover_positions), np.asarray(poi_positions)
+        rover_radii = np.broadcast_to(rover_radii, len(rover_positions))
+        poi_radii = np.broadcast_to(poi_radii, len(poi_positions))
+        if poi_observed is None:
+            poi_observed = np.zeros(len(poi_positions), dtype=bool)
+
+        # drawn in the viewer's order: body then observation radius, rovers then pois
+        for position, radius in zip(rover_positions, rover_radii):
+            self._circle(image, position, self.rover_size, ROVER, 0.5)
+            self._circle(image, position, radius, ROVER, 0.1)
+        for position, radius, observed in zip(poi_positions, poi_radii, poi_observed):
+            self._circle(image, position, self.poi_size, POI, 0.05 if observed else 0.5)
+            self._circle(image, position, radius, POI, 0.05 if observed else 0.1)
+
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        np.multiply(image, 255.0, out=image)
+        np.rint(image, out=image)
+        out[...] = image
+        return out
+
+    def render_batch(self, rover_positions, poi_positions, rover_radii=1.0, poi_radii=1.0,
+                     poi_observed=None):
+        """(T x H x W x 3) frames of many timesteps or environments: (T x N x 2) rover positions,
+        (M x 2) or (T x M x 2) poi positions and (M,) or (T x M) observed flags, e.g. from
+        trajectory(env) or a Recording episode."""
+        rover_positions = np.asarray(rover_positions)
+        frames = len(rover_positions)
+        poi_positions = np.broadcast_to(poi_positions, (frames,) + np.shape(poi_positions)[-2:])
+        if poi_observed is not None:
+            poi_observed = np.broadcast_to(poi_observed, (frames, poi_positions.shape[1]))
+        out = np.empty((frames,) + self.shape, dtype=np.uint8)
+        for t in range(frames):
+            self.render_arrays(rover_positions[t], rover_radii, poi_positions[t], poi_radii,
+                               None if poi_observed is None else poi_observed[t], out=out[t])
+        return out
+
+    def _grid(self):
+        """White background with a line per unit, as floats in [0, 1]; built once."""
+        image = np.ones(self.shape, dtype=np.float32)
+        left, bottom = self._pixel(0.0, 0.0)
+        right, top = self._pixel(self.width, self.height)
+        for x in range(int(self.width) + 1):
+            line = image[top:bottom + 1, self._pixel(x, 0.0)[0]]
+            line += 0.1 * (BLACK - line)
+        for y in range(int(self.height) + 1):
+            line = image[self._pixel(0.0, y)[1], left:right + 1]
+            line += 0.1 * (BLACK - line)
+        return image
+
+    def _pixel(self, x, y):
+        """(column, row) of a world point, clipped to the image."""
+        column = int(round((x + self.padding) * self.scale))
+        row = int(round((self.height + self.padding - y) * self.scale))
+        return min(max(column, 0), self.shape[1] - 1), min(max(row, 0), self.shape[0] - 1)
+
+    def _stamp(self, radius):
+        """Anti-aliased coverage of a disk of `radius` units, cached by its size in pixels."""
+        pixels = round(radius * self.scale * 4) / 4
+        stamp = self._stamps.get(pixels)
+        if stamp is None:
+            half = int(np.ceil(pixels)) + 1
+            offsets = np.arange(-half, half + 1, dtype=np.float32)
+            distance = np.hypot(offsets[:, None], offsets[None, :])
+            stamp = np.clip(pixels + 0.5 - distance, 0.0, 1.0)[..., None]
+            self._stamps[pixels] = stamp
+        return stamp
+
+    def _circle(self, image, position, radius, color, alpha):
+        """Alpha blends a filled circle into the image, cut at its borders."""
+        stamp = self._stamp(radius)
+        half = stamp.shape[0] // 2
+        column = int(round((position[0] + self.padding) * self.scale))
+        row = int(round((self.height + self.padding - position[1]) * self.scale))
+        r0, c0 = max(row - half, 0), max(column - half, 0)
+        r1, c1 = min(row + half + 1, self.shape[0]), min(column + half + 1, self.shape[1])
+        if r0 >= r1 or c0 >= c1:
+            return
+        coverage = stamp[r0 - row + half:r1 - row + half, c0 - column + half:c1 - column + half]
+        region = image[r0:r1, c0:c1]
+        region += (alpha * coverage) * (color - region)
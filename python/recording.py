@@ -0,0 +1,62 @@
+import numpy as np
+import os
+
+"""
+Reads the episode files written by Environment::record (see include/rovers/core/detail/recorder.hpp).
+The file is memory mapped: every array below is a view into it, nothing is copied or loaded up
+front. Only numpy is needed, not cppyy:
+    from recording import Recording
+    recording = Recording('episodes.bin')
+    for episode in recording.episodes():
+        episode['position']  # (steps, num_rovers, 2)
+"""
+
+MAGIC = b'ROVREC01'
+HEADER = np.dtype([('magic', 'S8'), ('header_size', '<u8'), ('num_rovers', '<u8'),
+                   ('num_pois', '<u8'), ('state_dim', '<u8'), ('action_dim', '<u8'),
+                   ('record_size', '<u8'), ('reserved', '<u8')])
+
+
+def record_dtype(num_rovers, num_pois, state_dim, action_dim):
+    return np.dtype([('episode', '<u4'), ('step', '<u4'),
+                     ('position', '<f4', (num_rovers, 2)),
+                     ('state', '<f4', (num_rovers, state_dim)),
+                     ('action', '<f4', (num_rovers, action_dim)),
+                     ('reward', '<f4', (num_rovers,)),
+                     ('observed', 'u1', (num_pois,))])
+
+
+class Recording:
+    def __init__(self, path):
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        if len(header) == 0 or header['magic'][0] != MAGIC:
+            raise ValueError(f'{path} is not a rovers episode file')
+        header = header[0]
+        self.num_rovers = int(header['num_rovers'])
+        self.num_pois = int(header['num_pois'])
+        self.state_dim = int(header['state_dim'])
+        self.action_dim = int(header['action_dim'])
+        dtype = record_dtype(self.num_rovers, self.num_pois, self.state_dim, self.action_dim)
+        if dtype.itemsize != header['record_size']:
+            raise ValueError(f'{path}: record size {header["record_size"]} does not match the schema')
+
+        # a recording that is still being written may end in a partial record: leave it out
+        size = os.path.getsize(path) - int(header['header_size'])
+        count = size // dtype.itemsize
+        self.records = np.memmap(path, dtype=dtype, mode='r', offset=int(header['header_size']),
+                                 shape=(count,)) if count else np.empty(0, dtype=dtype)
+        # episode i is records[starts[i]:starts[i + 1]]
+        episode = self.records['episode']
+        self.starts = np.concatenate(([0], np.flatnonzero(episode[1:] != episode[:-1]) + 1,
+                                      [count])) if count else np.zeros(1, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.starts) - 1
+
+    def episode(self, i):
+        """Fields of episode i, each (steps, ...); row 0 is the reset."""
+        records = self.records[self.starts[i]:self.starts[i + 1]]
+        return {name: records[name] for name in records.dtype.names}
+
+    def episodes(self):
+        return (self.episode(i) for i in range(len(self)))
@@ -132,9 +132,9 @@ if __name__ == "__main__":
     steps = 10000
     
     for step in range(steps):
-        states, rewards = env.step([
-            # rovers.tensor([random.uniform(-1.0, 1.0), random.uniform(-1.0, 1.0)]) 
-            rovers.tensor([0.05, 0.05])
-            for rover in env.rovers()])
+        # one (num_rovers x 2) array for all rovers
+        # actions = np.random.uniform(-1.0, 1.0, (len(env.rovers()), 2))
+        actions = np.full((len(env.rovers()), 2), 0.05)
+        states, rewards = step_array(env, actions)
         renderer.update()
         renderer.render()
\ No newline at end of file
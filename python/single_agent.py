@@ -37,12 +37,11 @@ episodes = 3
 for episode in range(0, episodes):
 
     states, rewards = env.reset()
-    done = False
-    
-    while not done:
-        states, rewards = env.step([
-            rovers.tensor([random.uniform(-1.0, 1.0), random.uniform(-1.0, 1.0)]) 
-            #rovers.tensor([0.09, 0.09])
-            for rover in env.rovers()])
+
+    # done once every poi is observed, see env.set_max_steps() to also cut episodes short
+    while not (env.done() or env.truncated()):
+        # one (num_rovers x 2) array for all rovers
+        states, rewards = step_array(env, np.random.uniform(-1.0, 1.0, (len(env.rovers()), 2)))
         renderer.render()
-        done = all (poi.observed() for poi in env.pois()) 
\ No newline at end of file
+    info = env.info()
+    print(f"episode {episode}: {info.steps} steps, total reward {info.total_reward}")
\ No newline at end of file
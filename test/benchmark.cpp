@@ -0,0 +1,158 @@
+#include <algorithm>
+#include <chrono>
+#include <cstdlib>
+#include <iostream>
+#include <rovers/environment.hpp>
+#include <rovers/core/rewards/difference.hpp>
+#include <rovers/utilities/spaces/discrete.hpp>
+#include <string>
+#include <vector>
+
+/*
+ *
+ * Step throughput and latency of the environment core over sweeps of the main parameters.
+ * Prints JSON, compare runs with python/compare_benchmarks.py:
+ *     make clean && make release entry=benchmark && ./build/bin/rovers > benchmark.json
+ * Each configuration is timed in several rounds, interleaved with the other configurations, and
+ * the fastest round is kept so that runs on one machine are comparable. Optional arguments set
+ * the number of timed steps per round and the number of rounds.
+ *
+ */
+using namespace rovers;
+
+struct Config {
+    std::string sweep;
+    std::size_t agents = 16;
+    std::size_t pois = 16;
+    double resolution = 90.0;
+    double size = 50.0;
+    std::string reward = "global";
+};
+
+struct Result {
+    Config config;
+    std::size_t steps;
+    double steps_per_sec;
+    double mean_us, p50_us, p90_us, p99_us;
+};
+
+Result run(const Config& config, std::size_t steps, unsigned seed = 7) {
+    using Dense = Lidar<Density>;
+    using Discrete = thyme::spaces::Discrete;
+    const double obs_radius = 5.0;
+
+    std::vector<Agent> rovers;
+    for (std::size_t i = 0; i < config.agents; ++i) {
+        if (config.reward == "difference")
+            rovers.push_back(Rover<Dense, Discrete, rewards::Difference>(
+                obs_radius, Dense(config.resolution)));
+        else
+            rovers.push_back(Rover<Dense, Discrete>(obs_radius, Dense(config.resolution)));
+    }
+    std::vector<Entity> pois;
+    for (std::size_t i = 0; i < config.pois; ++i)
+        pois.push_back(POI<CountConstraint>(1.0, 2.0, CountConstraint(2)));
+
+    // seeded uniform placement and actions so runs are reproducible
+    Environment<RandomInit> env(RandomInit(config.size, config.size), rovers, pois, config.size,
+                                config.size);
+    env.seed(seed);
+    thyme::math::Rng rng(seed, 1);
+    std::vector<double> actions(config.agents * 2);
+    auto step = [&]() {
+        for (auto& action : actions) action = rng.uniform(-1.0, 1.0);
+        return env.step(actions.data(), 2);
+    };
+
+    // episodes of 100 steps, resets are not timed
+    const std::size_t episode = 100, warmup = 20;
+    env.reset();
+    for (std::size_t s = 0; s < warmup; ++s) step();
+
+    std::vector<double> latencies;
+    latencies.reserve(steps);
+    for (std::size_t s = 0; s < steps; ++s) {
+        if ((s + warmup) % episode == 0) env.reset();
+        const auto start = std::chrono::steady_clock::now();
+        step();
+        const auto end = std::chrono::steady_clock::now();
+        latencies.push_back(std::chrono::duration<double, std::micro>(end - start).count());
+    }
+
+    Result result{config, steps, 0.0, 0.0, 0.0, 0.0, 0.0};
+    double total = 0.0;
+    for (const auto& latency : latencies) total += latency;
+    result.mean_us = total / steps;
+    result.steps_per_sec = 1e6 * steps / total;
+    std::sort(latencies.begin(), latencies.end());
+    auto percentile = [&](double p) { return latencies[std::size_t(p * (steps - 1))]; };
+    result.p50_us = percentile(0.50);
+    result.p90_us = percentile(0.90);
+    result.p99_us = percentile(0.99);
+    return result;
+}
+
+// one parameter varied at a time around the default configuration
+std::vector<Config> sweeps() {
+    std::vector<Config> configs;
+    for (std::size_t agents : {4, 16, 64, 256}) {
+        Config config{"agents"};
+        config.agents = agents;
+        configs.push_back(config);
+    }
+    for (std::size_t pois : {4, 64, 256}) {
+        Config config{"pois"};
+        config.pois = pois;
+        configs.push_back(config);
+    }
+    for (double resolution : {45.0, 10.0, 1.0}) {
+        Config config{"resolution"};
+        config.resolution = resolution;
+        configs.push_back(config);
+    }
+    for (double size : {10.0, 200.0}) {
+        Config config{"size"};
+        config.size = size;
+        configs.push_back(config);
+    }
+    Config scale{"scale"};
+    scale.agents = 1000, scale.pois = 10000, scale.size = 1000.0;
+    configs.push_back(scale);
+    Config difference{"reward"};
+    difference.reward = "difference";
+    configs.push_back(difference);
+    return configs;
+}
+
+void print(const Result& result, bool last) {
+    const auto& c = result.config;
+    std::cout << "    {\"sweep\": \"" << c.sweep << "\", \"agents\": " << c.agents
+              << ", \"pois\": " << c.pois << ", \"resolution\": " << c.resolution
+              << ", \"size\": " << c.size << ", \"components\": \"cpp\", \"reward\": \""
+              << c.reward << "\", \"steps\": " << result.steps
+              << ", \"steps_per_sec\": " << result.steps_per_sec
+              << ", \"latency_us\": {\"mean\": " << result.mean_us << ", \"p50\": " << result.p50_us
+              << ", \"p90\": " << result.p90_us << ", \"p99\": " << result.p99_us << "}}"
+              << (last ? "\n" : ",\n");
+}
+
+int main(int argc, char** argv) {
+    const std::size_t steps = argc > 1 ? std::strtoul(argv[1], nullptr, 10) : 1000;
+    const std::size_t rounds = argc > 2 ? std::strtoul(argv[2], nullptr, 10) : 5;
+
+    const auto configs = sweeps();
+    std::vector<Result> best;
+    for (std::size_t round = 0; round < rounds; ++round) {
+        for (std::size_t i = 0; i < configs.size(); ++i) {
+            Result result = run(configs[i], steps);
+            if (round == 0)
+                best.push_back(result);
+            else if (result.steps_per_sec > best[i].steps_per_sec)
+                best[i] = result;
+        }
+    }
+    std::cout << "{\n  \"suite\": \"cpp\",\n  \"results\": [\n";
+    for (std::size_t i = 0; i < best.size(); ++i) print(best[i], i + 1 == best.size());
+    std::cout << "  ]\n}" << std::endl;
+    return 0;
+}
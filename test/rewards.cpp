@@ -0,0 +1,148 @@
+#include <cmath>
+#include <iostream>
+#include <rovers/core/poi/type_constraint.hpp>
+#include <rovers/core/rewards/difference.hpp>
+#include <rovers/environment.hpp>
+#include <rovers/utilities/spaces/discrete.hpp>
+#include <vector>
+
+/*
+ *
+ * Rewards and observed flags of random scenarios against a brute-force reference that rechecks
+ * every constraint from the rover positions: each rover gets the step's global reward G (value of
+ * the unobserved pois satisfied this step) or its difference reward G - G without it, and pois
+ * become observed after the rewards are computed. Some rovers stand still on each step, so the
+ * environment's incremental observer counts are exercised too, and half of the scenarios rebind
+ * new pois after the first reset. Last, a rover right on the edge of its observation range, where
+ * squared and plain distances round differently.
+ *     make clean && make release entry=rewards && ./build/bin/rovers
+ *
+ */
+using namespace rovers;
+
+// value of the unobserved pois whose constraints the agents satisfy
+double global_reward(const Agents& agents, const Entities& pois, const std::vector<char>& observed) {
+    double reward = 0.0;
+    for (std::size_t j = 0; j < pois.size(); ++j) {
+        if (!observed[j] && pois[j]->constraint_satisfied({pois[j], agents, pois}))
+            reward += pois[j]->value();
+    }
+    return reward;
+}
+
+int main() {
+    using Dense = Lidar<Density>;
+    using Discrete = thyme::spaces::Discrete;
+    const std::size_t scenarios = 30, steps = 50;
+
+    std::size_t checked = 0, mismatches = 0;
+    // this step's rewards and observed flags, given the flags before it
+    auto check = [&](const Agents& rovers, const Entities& pois, const std::vector<bool>& difference,
+                     const std::vector<char>& observed, const std::vector<double>& rewards) {
+        const double global = global_reward(rovers, pois, observed);
+        for (std::size_t i = 0; i < rovers.size(); ++i) {
+            double expected = global;
+            if (difference[i]) {
+                Agents without;
+                for (std::size_t k = 0; k < rovers.size(); ++k)
+                    if (k != i) without.push_back(rovers[k]);
+                expected -= global_reward(without, pois, observed);
+            }
+            ++checked;
+            if (std::abs(rewards[i] - expected) > 1e-9) ++mismatches;
+        }
+        for (std::size_t j = 0; j < pois.size(); ++j) {
+            const bool satisfied = pois[j]->constraint_satisfied({pois[j], rovers, pois});
+            ++checked;
+            if (pois[j]->observed() != (observed[j] || satisfied)) ++mismatches;
+        }
+    };
+    for (std::size_t scenario = 0; scenario < scenarios; ++scenario) {
+        thyme::math::Rng rng(scenario);
+
+        Agents rovers;
+        std::vector<bool> difference;
+        const std::size_t num_rovers = 2 + rng.integer(10);
+        for (std::size_t i = 0; i < num_rovers; ++i) {
+            const double obs_radius = rng.uniform(1.0, 4.0);
+            difference.push_back(rng.uniform() < 0.5);
+            if (difference.back())
+                rovers << Rover<Dense, Discrete, rewards::Difference>(obs_radius, Dense(90));
+            else
+                rovers << Rover<Dense, Discrete>(obs_radius, Dense(90));
+            rovers.back()->set_type(rng.integer(2));
+        }
+        Entities pois;
+        const std::size_t num_pois = 1 + rng.integer(20);
+        for (std::size_t j = 0; j < num_pois; ++j) {
+            const double value = rng.uniform(0.5, 5.0), obs_radius = rng.uniform(0.5, 3.0);
+            if (rng.uniform() < 0.5)
+                pois << POI<CountConstraint>(value, obs_radius, CountConstraint(1 + rng.integer(3)));
+            else
+                pois << POI<TypeConstraint>(
+                    value, obs_radius,
+                    TypeConstraint(std::vector<size_t>{rng.integer(3), rng.integer(2)}));
+        }
+
+        Environment<RandomInit> env(RandomInit(12.0, 12.0), rovers, pois, 12, 12);
+        env.seed(scenario);
+        env.reset();
+        for (std::size_t step = 0; step < steps; ++step) {
+            if (step == 0 && scenario % 2 == 1) {
+                // new pois where the old ones were and rovers back at the same positions: the
+                // world must not keep the old observer counts
+                Entities easier;
+                for (const auto& poi : pois)
+                    easier << POI<CountConstraint>(poi->value(), poi->obs_radius(), CountConstraint(1));
+                pois = easier;
+                env.set_pois(pois);
+                env.seed(scenario);
+                env.reset();
+            }
+            std::vector<char> observed;
+            for (const auto& poi : pois) observed.push_back(poi->observed());
+
+            Actions actions;
+            for (std::size_t i = 0; i < num_rovers; ++i) {
+                if (rng.uniform() < 0.3)
+                    actions.emplace_back(Eigen::Vector2d::Zero());
+                else
+                    actions.emplace_back(Eigen::Vector2d(rng.uniform(-1, 1), rng.uniform(-1, 1)));
+            }
+            auto [states, rewards] = env.step(actions);
+            check(rovers, pois, difference, observed, rewards);
+        }
+    }
+
+    // rover 0 on the edge of its observation range around the poi: within it by l2_norm, although
+    // its squared distance rounds above radius^2. Rover 1 sits on the poi. Either alone satisfies
+    // the first poi, both are needed for the second.
+    const thyme::math::Point at(7.7, 4.2);
+    const double edge = 3.4;
+    thyme::math::Rng rng(1);
+    thyme::math::Point on_edge;
+    for (bool found = false; !found;) {
+        const double angle = rng.uniform(0.0, 2.0 * M_PI);
+        on_edge = {at.x + edge * std::cos(angle), at.y + edge * std::sin(angle)};
+        const double x = at.x - on_edge.x, y = at.y - on_edge.y;
+        found = thyme::math::l2_norm(on_edge, at) <= edge && x * x + y * y > edge * edge;
+    }
+    for (std::size_t count : {1, 2}) {
+        Agents rovers;
+        rovers << Rover<Dense, Discrete, rewards::Difference>(edge, Dense(90));
+        rovers << Rover<Dense, Discrete, rewards::Difference>(1.0, Dense(90));
+        Entities pois;
+        pois << POI<CountConstraint>(1.0, edge + 0.5, CountConstraint(count));
+        Environment<RandomInit> env(RandomInit(12.0, 12.0), rovers, pois, 12, 12);
+        env.reset();
+        rovers[0]->set_position(on_edge.x, on_edge.y);
+        rovers[1]->set_position(at.x, at.y);
+        pois[0]->set_position(at.x, at.y);
+        auto [states, rewards] = env.step(Actions(2, Eigen::Vector2d::Zero()));
+        check(rovers, pois, {true, true}, {0}, rewards);
+    }
+
+    std::cout << checked << " rewards and observed flags checked, " << mismatches << " mismatches"
+              << std::endl;
+    return mismatches == 0 ? 0 : 1;
+}
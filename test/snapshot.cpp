@@ -0,0 +1,100 @@
+#include <iostream>
+#include <rovers/core/setup/init_random.hpp>
+#include <rovers/environment.hpp>
+#include <rovers/utilities/spaces/discrete.hpp>
+#include <vector>
+
+/*
+ *
+ * Snapshots of sibling branches, then along a random tree of branches and resets: after each
+ * restore the rovers are back at the snapshot's positions and the path history is exactly the
+ * snapshot's path, whichever branch was taken since.
+ *     make clean && make release entry=snapshot && ./build/bin/rovers
+ *
+ */
+using namespace rovers;
+
+int main() {
+    using Dense = Lidar<Density>;
+    using Discrete = thyme::spaces::Discrete;
+    const std::size_t num_rovers = 3, restores = 500;
+
+    Agents rovers;
+    for (std::size_t i = 0; i < num_rovers; ++i) rovers << Rover<Dense, Discrete>(2.0, Dense(90));
+    Entities pois;
+    for (std::size_t j = 0; j < 4; ++j) pois << POI<CountConstraint>(1.0, 1.0, CountConstraint(2));
+
+    Environment<RandomInit> env(RandomInit(10.0, 10.0), rovers, pois, 10, 10);
+    env.seed(7);
+    env.reset();
+
+    std::size_t checked = 0, mismatches = 0;
+    auto step = [&](thyme::math::Rng& rng, std::size_t steps) {
+        for (std::size_t k = 0; k < steps; ++k) {
+            Actions actions;
+            for (std::size_t i = 0; i < num_rovers; ++i)
+                actions.emplace_back(Eigen::Vector2d(rng.uniform(-1, 1), rng.uniform(-1, 1)));
+            env.step(actions);
+        }
+    };
+
+    // sibling branches past a chunk of frames: a, 3 steps to b, back to a, 5 steps, back to b
+    {
+        thyme::math::Rng rng(1);
+        step(rng, Trajectory::chunk_frames + 6);
+        const Snapshot a = env.snapshot();
+        const std::vector<float> path_a = env.trajectory().packed();
+        step(rng, 3);
+        const Snapshot b = env.snapshot();
+        const std::vector<float> path_b = env.trajectory().packed();
+        for (std::size_t k = 0; k < 3; ++k) {
+            env.restore(a);
+            ++checked;
+            if (env.trajectory().packed() != path_a) ++mismatches;
+            step(rng, 5);
+        }
+        env.restore(b);
+        ++checked;
+        if (env.trajectory().packed() != path_b) ++mismatches;
+        // and again after a reset
+        env.reset();
+        env.restore(a);
+        ++checked;
+        if (env.trajectory().packed() != path_a) ++mismatches;
+    }
+    env.reset();
+
+    struct Node {
+        Snapshot snapshot;
+        std::vector<float> path;
+    };
+    std::vector<Node> nodes;
+    auto take = [&]() { nodes.push_back({env.snapshot(), env.trajectory().packed()}); };
+    take();
+
+    thyme::math::Rng rng(7);
+    for (std::size_t k = 0; k < restores; ++k) {
+        const Node& node = nodes[rng.integer(nodes.size())];
+        env.restore(node.snapshot);
+
+        ++checked;
+        for (std::size_t i = 0; i < num_rovers; ++i) {
+            const auto& position = rovers[i]->position();
+            const auto& expected = node.snapshot.agents.position[i];
+            if (position.x != expected.x || position.y != expected.y) ++mismatches;
+        }
+        ++checked;
+        if (env.trajectory().packed() != node.path) ++mismatches;
+
+        // branch off, now and then from a new episode
+        if (rng.integer(20) == 0) env.reset();
+        step(rng, 1 + rng.integer(5));
+        take();
+        env.restore(nodes.back().snapshot);
+        ++checked;
+        if (env.trajectory().packed() != nodes.back().path) ++mismatches;
+    }
+
+    std::cout << checked << " restores checked, " << mismatches << " mismatches" << std::endl;
+    return mismatches == 0 ? 0 : 1;
+}
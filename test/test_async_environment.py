@@ -0,0 +1,122 @@
+import os
+import sys
+import types
+
+import numpy as np
+
+"""
+AsyncVecEnvironment end to end with stub environments, no bindings needed: the workers are forked
+with a stand-in `librovers` module that provides buffers() and step_array().
+    python -m pytest -q test/test_async_environment.py
+"""
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'python'))
+
+from async_environment import AsyncVecEnvironment  # noqa: E402
+
+NUM_ROVERS, STATE_SIZE, ACTION_DIM = 3, 4, 2
+
+
+class StubEnv:
+    """Buffered environment: each step adds the rover's action sum to its state, the reward is the
+    step count, episodes end after max_steps."""
+
+    def __init__(self):
+        self.states = np.zeros((NUM_ROVERS, STATE_SIZE))
+        self.rewards = np.zeros(NUM_ROVERS)
+        self.max_steps = 0
+        self.steps = 0
+        self.offset = 0.0
+
+    def set_buffered(self, buffered):
+        pass
+
+    def set_max_steps(self, max_steps):
+        self.max_steps = max_steps
+
+    def seed(self, seed, stream):
+        self.offset = 100.0 * stream
+
+    def reset(self):
+        self.steps = 0
+        self.states[...] = self.offset
+        self.rewards[...] = 0.0
+
+    def step(self, actions):
+        self.steps += 1
+        self.states += actions.sum(axis=1, keepdims=True)
+        self.rewards[...] = self.steps
+
+    def done(self):
+        return False
+
+    def truncated(self):
+        return self.max_steps > 0 and self.steps >= self.max_steps
+
+
+def _buffers(env):
+    return env.states, env.rewards
+
+
+def _step_array(env, actions):
+    env.step(np.asarray(actions))
+
+
+def make_env():
+    return StubEnv()
+
+
+def _async_envs(num_envs, max_steps):
+    sys.modules['librovers'] = types.ModuleType('librovers')
+    sys.modules['librovers'].buffers = _buffers
+    sys.modules['librovers'].step_array = _step_array
+    return AsyncVecEnvironment([make_env] * num_envs, max_steps=max_steps, action_dim=ACTION_DIM,
+                               seed=0, context='fork')
+
+
+def test_reset_and_step():
+    envs = _async_envs(2, max_steps=3)
+    try:
+        assert (envs.num_rovers, envs.state_size) == (NUM_ROVERS, STATE_SIZE)
+        states, rewards = envs.reset()
+        assert states.shape == (2, NUM_ROVERS, STATE_SIZE)
+        np.testing.assert_array_equal(states[0], 0.0)
+        np.testing.assert_array_equal(states[1], 100.0)
+        np.testing.assert_array_equal(rewards, 0.0)
+
+        actions = np.ones((2 * NUM_ROVERS, ACTION_DIM))
+        for step in range(1, 3):
+            states, rewards, dones = envs.step(actions)
+            np.testing.assert_array_equal(states[0], 2.0 * step)
+            np.testing.assert_array_equal(states[1], 100.0 + 2.0 * step)
+            np.testing.assert_array_equal(rewards, step)
+            assert not dones.any()
+
+        # the third step truncates: final rewards, initial states
+        states, rewards, dones = envs.step(actions)
+        assert dones.all()
+        np.testing.assert_array_equal(rewards, 3)
+        np.testing.assert_array_equal(states[0], 0.0)
+        np.testing.assert_array_equal(states[1], 100.0)
+
+        states, rewards, dones = envs.step(actions)
+        assert not dones.any()
+        np.testing.assert_array_equal(states[0], 2.0)
+    finally:
+        envs.close()
+
+
+def test_step_async_overlaps():
+    envs = _async_envs(3, max_steps=0)
+    try:
+        envs.reset()
+        actions = np.arange(3 * NUM_ROVERS * ACTION_DIM, dtype=np.float64).reshape((3, NUM_ROVERS, ACTION_DIM))
+        envs.step_async(actions)
+        actions[...] = 0.0  # copied by step_async
+        states, rewards, dones = envs.step_wait()
+        expected = np.arange(3 * NUM_ROVERS * ACTION_DIM).reshape((3, NUM_ROVERS, ACTION_DIM)).sum(axis=2)
+        for i in range(3):
+            assert (states[i] == 100.0 * i + expected[i][:, None]).all()
+        assert not dones.any()
+    finally:
+        envs.close()
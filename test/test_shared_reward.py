@@ -0,0 +1,100 @@
+import importlib.util
+import os
+import sys
+import types
+
+import numpy as np
+
+"""
+SharedReward from python/5_custom_rewards.py pays the same per rover through compute() and
+compute_batch(), with rovers and pois of mixed radii. No bindings needed: the example is loaded with
+a stand-in `librovers` module, and worlds are plain arrays.
+    python -m pytest -q test/test_shared_reward.py
+"""
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'python', '5_custom_rewards.py')
+
+
+def _load_example():
+    librovers = types.ModuleType('librovers')
+    librovers.rovers = types.SimpleNamespace(rewards=types.SimpleNamespace(IReward=object))
+    librovers.world_arrays = lambda world: world
+    librovers.from_numpy = lambda array: array
+    sys.modules['librovers'] = librovers
+    spec = importlib.util.spec_from_file_location('custom_rewards', EXAMPLE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Point:
+    def __init__(self, position):
+        self.x, self.y = position
+
+
+class Body:
+    def __init__(self, position, radius, value=1.0, satisfied=False):
+        self._position, self._radius, self._value, self._satisfied = Point(position), radius, value, satisfied
+
+    def position(self):
+        return self._position
+
+    def obs_radius(self):
+        return self._radius
+
+    def value(self):
+        return self._value
+
+    def observed(self):
+        return False
+
+    def constraint_satisfied(self, pack):
+        return self._satisfied
+
+
+def _world(rng, num_rovers, num_pois):
+    """Rover and poi arrays as world_arrays() returns them; observers counted as World::update does:
+    a rover observes a poi within both radii."""
+    agent_position = rng.uniform(0, 4, (num_rovers, 2))
+    agent_radius = rng.choice([0.5, 1.0, 3.0], num_rovers)
+    poi_position = rng.uniform(0, 4, (num_pois, 2))
+    poi_radius = rng.choice([0.5, 2.0], num_pois)
+    # one rover exactly on the edge of both its own and the first poi's radius
+    agent_position[0] = poi_position[0] + [agent_radius[0], 0.0]
+    poi_radius[0] = agent_radius[0]
+
+    observers = np.zeros(num_pois, dtype=np.uint64)
+    for i in range(num_rovers):
+        for j in range(num_pois):
+            dx, dy = poi_position[j] - agent_position[i]
+            distance = np.sqrt(dx * dx + dy * dy)
+            observers[j] += distance <= agent_radius[i] and distance <= poi_radius[j]
+    return {
+        'agent_position': agent_position,
+        'agent_radius': agent_radius,
+        'poi_position': poi_position,
+        'poi_radius': poi_radius,
+        'poi_value': rng.uniform(1, 5, num_pois),
+        'observers': observers,
+        'newly_observed': np.flatnonzero(observers > 0)[::2],
+    }
+
+
+def test_compute_matches_compute_batch():
+    example = _load_example()
+    reward = example.SharedReward()
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        world = _world(rng, num_rovers=8, num_pois=6)
+        newly_observed = set(world['newly_observed'].tolist())
+        rovers = [Body(p, r) for p, r in zip(world['agent_position'], world['agent_radius'])]
+        pois = [Body(p, r, v, j in newly_observed)
+                for j, (p, r, v) in enumerate(zip(world['poi_position'], world['poi_radius'], world['poi_value']))]
+
+        agents = range(len(rovers))
+        batch = reward.compute_batch(world, agents)
+        for i in agents:
+            pack = types.SimpleNamespace(agent=rovers[i], agents=rovers, entities=pois)
+            assert np.isclose(reward.compute(pack), batch[i])
+        # every observed poi is paid out once in full
+        assert np.isclose(batch.sum(), world['poi_value'][world['newly_observed']].sum())